@@ -1,20 +1,47 @@
 # train.py - Model Training with Registry Storage
 
+import argparse
 import json
+import shutil
+import tempfile
+import time
 from datetime import datetime
 from pathlib import Path
 
 import joblib
+from scipy.stats import loguniform
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import accuracy_score, classification_report
-from sklearn.model_selection import GridSearchCV, train_test_split
+from sklearn.model_selection import (
+    GridSearchCV,
+    HalvingRandomSearchCV,
+    RandomizedSearchCV,
+    train_test_split,
+)
 from sklearn.pipeline import Pipeline
 
 from registry import ModelRegistry
 from text_utils import clean_text
 
 MODEL_VERSION = "1.0.0"
+CV_FOLDS = 5
+
+# Exhaustive search (--search grid)
+PARAM_GRID = {
+    "clf__C": [0.1, 1.0, 10.0],
+    "clf__max_iter": [500, 1000, 2000],
+}
+
+# Sampled searches (--search random / halving) also tune the vectorizer
+PARAM_DISTRIBUTIONS = {
+    "tfidf__ngram_range": [(1, 1), (1, 2)],
+    "tfidf__min_df": [1, 2],
+    "tfidf__max_features": [None, 5000, 20000],
+    "tfidf__sublinear_tf": [False, True],
+    "clf__C": loguniform(1e-2, 1e2),
+}
 
 
 def get_data():
@@ -45,51 +72,116 @@ def get_data():
     return texts, labels
 
 
-def build_model():
+def build_model(memory=None):
+    """
+    `memory` (a cache directory) makes the Pipeline cache each fitted
+    tfidf step, keyed by its parameters and training fold. A grid over
+    `clf__*` parameters then vectorizes every CV fold only once.
+    """
     pipeline = Pipeline(
         [
             ("tfidf", TfidfVectorizer(preprocessor=clean_text)),
             ("clf", LogisticRegression(max_iter=1000)),
-        ]
+        ],
+        memory=memory,
     )
     return pipeline
 
 
+def build_search(strategy: str, estimator, budget: int, n_jobs: int, seed: int):
+    """
+    - grid: every PARAM_GRID combination (budget is ignored)
+    - random: `budget` candidates sampled from PARAM_DISTRIBUTIONS
+    - halving: `budget` sampled candidates, first scored on a small sample
+      of the training set; each round keeps the best third on 3x the
+      samples (the last round uses all of them), so weak configurations
+      never see the full data
+    """
+    common = {"cv": CV_FOLDS, "scoring": "accuracy", "n_jobs": n_jobs}
+    if strategy == "grid":
+        return GridSearchCV(estimator, PARAM_GRID, **common)
+    if strategy == "random":
+        return RandomizedSearchCV(
+            estimator, PARAM_DISTRIBUTIONS, n_iter=budget, random_state=seed, **common
+        )
+    if strategy == "halving":
+        return HalvingRandomSearchCV(
+            estimator,
+            PARAM_DISTRIBUTIONS,
+            n_candidates=budget,
+            resource="n_samples",
+            min_resources="exhaust",
+            factor=3,
+            random_state=seed,
+            **common,
+        )
+    raise ValueError(f"Unknown search strategy {strategy!r}")
+
+
 def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--search", choices=["grid", "random", "halving"], default="grid")
+    parser.add_argument("--budget", type=int, default=20,
+                        help="candidates sampled by the random / halving searches")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--n-jobs", type=int, default=-1,
+                        help="parallel CV fits (-1 = all cores, 1 = sequential)")
+    parser.add_argument("--no-pipeline-cache", action="store_true",
+                        help="refit the vectorizer for every grid point")
+    args = parser.parse_args()
+
     registry = ModelRegistry()
 
     X, y = get_data()
 
-    print("=== Hyperparameter Tuning ===")
-    base_model = build_model()
+    # Halving starts from 2 samples per class and fold
+    min_samples = 2 * CV_FOLDS * len(set(y))
+    if args.search == "halving" and len(X) < min_samples:
+        raise SystemExit(f"--search halving needs at least {min_samples} samples "
+                         f"(2 x {CV_FOLDS} folds x {len(set(y))} classes), got {len(X)}; "
+                         f"use --search random on small datasets")
 
-    param_grid = {
-        "clf__C": [0.1, 1.0, 10.0],
-        "clf__max_iter": [500, 1000, 2000],
-    }
+    print(f"=== Hyperparameter Tuning ({args.search}) ===")
+    # Shared by all CV workers; removed once the search is done
+    cache_dir = None if args.no_pipeline_cache else tempfile.mkdtemp(prefix="train-cache-")
+    base_model = build_model(memory=cache_dir)
 
-    grid = GridSearchCV(
-        estimator=base_model,
-        param_grid=param_grid,
-        cv=5,
-        scoring="accuracy",
-    )
+    grid = build_search(args.search, base_model, args.budget, args.n_jobs, args.seed)
 
-    grid.fit(X, y)
+    start = time.perf_counter()
+    try:
+        grid.fit(X, y)
+    finally:
+        if cache_dir:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+    search_seconds = time.perf_counter() - start
 
     best_params = grid.best_params_
     best_cv_accuracy = float(grid.best_score_)
 
+    # Halving re-scores surviving candidates every round: cv_results_ has one
+    # row per (candidate, round), the first round scores every candidate
+    if args.search == "halving":
+        candidates = int(grid.n_candidates_[0])
+    else:
+        candidates = len(grid.cv_results_["params"])
+    cv_fits = len(grid.cv_results_["params"]) * CV_FOLDS
+
     print("Best params:", best_params)
     print("Best CV accuracy:", best_cv_accuracy)
+    print(f"Candidates evaluated: {candidates} ({cv_fits} CV fits)")
+    print(f"Search time: {search_seconds:.2f}s")
 
-    best_model = grid.best_estimator_
+    # The cache directory is gone; don't pickle a reference to it
+    best_model = grid.best_estimator_.set_params(memory=None)
 
     X_train, X_test, y_train, y_test = train_test_split(
         X, y, test_size=0.3, random_state=42, stratify=y
     )
 
+    start = time.perf_counter()
     best_model.fit(X_train, y_train)
+    refit_seconds = time.perf_counter() - start
 
     y_pred = best_model.predict(X_test)
 
@@ -105,7 +197,26 @@ def main():
         "best_params": best_params,
         "best_cv_accuracy": best_cv_accuracy,
         "test_accuracy": test_accuracy,
+        "search": {
+            "strategy": args.search,
+            "budget": None if args.search == "grid" else args.budget,
+            "candidates_evaluated": candidates,
+            "cv_folds": CV_FOLDS,
+            "cv_fits": cv_fits,
+        },
+        "training": {
+            "n_jobs": args.n_jobs,
+            "pipeline_cache": cache_dir is not None,
+            "search_seconds": round(search_seconds, 3),
+            "refit_seconds": round(refit_seconds, 3),
+            "mean_fit_seconds": round(float(grid.cv_results_["mean_fit_time"].mean()), 4),
+        },
     }
+    if args.search == "halving":
+        metadata["search"]["rounds"] = [
+            {"candidates": int(c), "samples": int(n)}
+            for c, n in zip(grid.n_candidates_, grid.n_resources_)
+        ]
 
     registry.save_model(MODEL_VERSION, best_model, metadata)
 
@@ -0,0 +1,321 @@
+# load_test.py - HTTP load test for the python-api and the Fastify gateway
+#
+# Usage (from the micro-task folder):
+#   # start both services locally, drive /predict on each, save JSON results
+#   python benchmarks/load_test.py --start python,gateway --scenarios predict,gateway-predict
+#
+#   # against already running services, with a version mix and long texts
+#   python benchmarks/load_test.py --python-url http://localhost:8000 \
+#       --scenarios predict,models --versions 1.0.0:0.2,latest:0.8 \
+#       --text-length lognormal:3.5:0.8 --concurrency 32 --duration 30
+#
+#   # compare server configurations (passed to the python-api as env vars)
+#   python benchmarks/load_test.py --start python --workers 4 \
+#       --api-env MICRO_BATCHING=1 --api-env PREDICTION_CACHE_BYTES=50000000
+#
+# Results (config, git commit, RPS, p50/p95/p99 per scenario) are written to
+# benchmarks/results/<timestamp>.json unless --output is given.
+
+import argparse
+import http.client
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlsplit
+
+TASK_DIR = Path(__file__).resolve().parent.parent
+
+WORDS = ["great", "terrible", "product", "service", "love", "hate", "ok", "really",
+         "not", "good", "at", "all", "experience", "would", "buy", "again", "awful",
+         "fantastic", "delivery", "quality", "price", "support", "broken", "works"]
+
+# name -> (service, method, path)
+SCENARIOS = {
+    "predict": ("python", "POST", "/predict"),
+    "batch": ("python", "POST", "/predict/batch"),
+    "models": ("python", "GET", "/models"),
+    "gateway-predict": ("gateway", "POST", "/predict"),
+}
+
+
+# -----------------------------------------------------------------------------
+# Workload generation
+# -----------------------------------------------------------------------------
+def parse_text_length(spec: str):
+    """
+    Word-count distribution: fixed:N, uniform:MIN:MAX or lognormal:MU:SIGMA
+    (natural-log parameters, e.g. lognormal:3:0.8 has a median of ~20 words).
+    """
+    kind, *params = spec.split(":")
+    params = [float(p) for p in params]
+    if kind == "fixed":
+        return lambda rng: int(params[0])
+    if kind == "uniform":
+        return lambda rng: rng.randint(int(params[0]), int(params[1]))
+    if kind == "lognormal":
+        return lambda rng: max(1, int(rng.lognormvariate(params[0], params[1])))
+    raise ValueError(f"Unknown text length distribution {spec!r}")
+
+
+def parse_versions(spec: str):
+    """'1.0.0:0.2,latest:0.8' -> ([None-or-version...], [weights...])."""
+    versions, weights = [], []
+    for part in spec.split(","):
+        name, _, weight = part.partition(":")
+        versions.append(None if name in ("", "latest") else name)
+        weights.append(float(weight) if weight else 1.0)
+    return versions, weights
+
+
+class Workload:
+    def __init__(self, text_length, versions, weights, batch_size: int, seed: int):
+        self.text_length = text_length
+        self.versions = versions
+        self.weights = weights
+        self.batch_size = batch_size
+        self.seed = seed
+
+    def text(self, rng):
+        return " ".join(rng.choice(WORDS) for _ in range(self.text_length(rng)))
+
+    def body(self, scenario: str, rng):
+        if scenario == "models":
+            return None
+        version = rng.choices(self.versions, self.weights)[0]
+        if scenario == "batch":
+            payload = {"texts": [self.text(rng) for _ in range(self.batch_size)]}
+        else:
+            payload = {"text": self.text(rng)}
+        if version:
+            payload["version"] = version
+        return json.dumps(payload).encode()
+
+
+# -----------------------------------------------------------------------------
+# Load generation
+# -----------------------------------------------------------------------------
+def percentile(sorted_values, q: float):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, math.ceil(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def run_scenario(name: str, base_url: str, workload: Workload, concurrency: int,
+                 duration: float, warmup: float, headers: dict):
+    """
+    Drive one endpoint with `concurrency` keep-alive connections (one thread
+    each) for `warmup` + `duration` seconds; only the measured window counts.
+    """
+    _, method, path = SCENARIOS[name]
+    url = urlsplit(base_url)
+    request_headers = {"Content-Type": "application/json", **headers}
+
+    start = time.perf_counter()
+    measure_from = start + warmup
+    stop_at = measure_from + duration
+    results = []  # per thread: list of (latency_s, status)
+    lock = threading.Lock()
+
+    def worker(index):
+        rng = random.Random(workload.seed + index)
+        conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=30)
+        samples = []
+        while True:
+            body = workload.body(name, rng)
+            t0 = time.perf_counter()
+            if t0 >= stop_at:
+                break
+            try:
+                conn.request(method, path, body=body, headers=request_headers)
+                response = conn.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=30)
+                status = 0
+            t1 = time.perf_counter()
+            if t0 >= measure_from:
+                samples.append((t1 - t0, status))
+        conn.close()
+        with lock:
+            results.append(samples)
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    samples = [s for thread_samples in results for s in thread_samples]
+    latencies = sorted(latency * 1000 for latency, status in samples if 200 <= status < 300)
+    statuses = {}
+    for _, status in samples:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+    return {
+        "scenario": name,
+        "url": base_url + path,
+        "requests": len(samples),
+        "errors": len(samples) - len(latencies),
+        "statusCounts": statuses,
+        "rps": round(len(samples) / duration, 2),
+        "latencyMs": {
+            "mean": round(sum(latencies) / len(latencies), 3) if latencies else None,
+            "p50": round(percentile(latencies, 50), 3) if latencies else None,
+            "p95": round(percentile(latencies, 95), 3) if latencies else None,
+            "p99": round(percentile(latencies, 99), 3) if latencies else None,
+            "max": round(latencies[-1], 3) if latencies else None,
+        },
+    }
+
+
+# -----------------------------------------------------------------------------
+# Local services
+# -----------------------------------------------------------------------------
+def wait_for(url: str, path: str, timeout: float = 60.0):
+    parts = urlsplit(url)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=2)
+            conn.request("GET", path)
+            if conn.getresponse().status == 200:
+                return
+        except (OSError, http.client.HTTPException):
+            pass
+        time.sleep(0.25)
+    raise SystemExit(f"{url}{path} did not become ready within {timeout:.0f}s")
+
+
+def start_python_api(port: int, workers: int, api_env):
+    env = {**os.environ, **dict(item.split("=", 1) for item in api_env)}
+    if workers > 1:
+        cmd = [sys.executable, "serve.py", "--workers", str(workers), "--port", str(port),
+               "--memory-report-seconds", "0"]
+    else:
+        cmd = [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"]
+    process = subprocess.Popen(cmd, cwd=TASK_DIR / "python-api", env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    wait_for(url, "/ready")
+    return process, url
+
+
+def start_gateway(port: int, python_url: str, api_key: str):
+    env = {**os.environ, "PORT": str(port), "PYTHON_API_BASE_URL": python_url, "API_KEYS": api_key}
+    process = subprocess.Popen(["node", "server.js"], cwd=TASK_DIR / "fastify-service", env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    wait_for(url, "/health")
+    return process, url
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=TASK_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# -----------------------------------------------------------------------------
+# Main
+# -----------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scenarios", type=str, default="predict",
+                        help=f"comma-separated: {', '.join(SCENARIOS)}")
+    parser.add_argument("--start", type=str, default="",
+                        help="services to start locally: python, gateway or python,gateway")
+    parser.add_argument("--python-url", type=str, default="http://127.0.0.1:8000")
+    parser.add_argument("--gateway-url", type=str, default="http://127.0.0.1:3000")
+    parser.add_argument("--python-port", type=int, default=18000)
+    parser.add_argument("--gateway-port", type=int, default=13000)
+    parser.add_argument("--workers", type=int, default=1,
+                        help="python-api processes when started locally (>1 uses serve.py)")
+    parser.add_argument("--api-env", action="append", default=[], metavar="KEY=VALUE",
+                        help="env var for the locally started python-api (repeatable)")
+    parser.add_argument("--api-key", type=str, default=os.getenv("BENCH_API_KEY", "bench-key"))
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=15.0, help="measured seconds per scenario")
+    parser.add_argument("--warmup", type=float, default=3.0, help="unmeasured seconds per scenario")
+    parser.add_argument("--text-length", type=str, default="uniform:5:40")
+    parser.add_argument("--versions", type=str, default="latest")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=str, default=None)
+    args = parser.parse_args()
+
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = [s for s in scenarios if s not in SCENARIOS]
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {', '.join(unknown)}")
+
+    versions, weights = parse_versions(args.versions)
+    workload = Workload(parse_text_length(args.text_length), versions, weights,
+                        args.batch_size, args.seed)
+
+    processes = []
+    python_url, gateway_url = args.python_url, args.gateway_url
+    to_start = {s.strip() for s in args.start.split(",") if s.strip()}
+    try:
+        if "python" in to_start:
+            process, python_url = start_python_api(args.python_port, args.workers, args.api_env)
+            processes.append(process)
+        if "gateway" in to_start:
+            process, gateway_url = start_gateway(args.gateway_port, python_url, args.api_key)
+            processes.append(process)
+
+        results = []
+        for name in scenarios:
+            service = SCENARIOS[name][0]
+            base_url = python_url if service == "python" else gateway_url
+            headers = {"x-api-key": args.api_key} if service == "gateway" else {}
+            result = run_scenario(name, base_url, workload, args.concurrency,
+                                  args.duration, args.warmup, headers)
+            results.append(result)
+            latency = result["latencyMs"]
+            print(f"{name:<16} {result['rps']:>9.1f} rps  p50 {latency['p50']} ms  "
+                  f"p95 {latency['p95']} ms  p99 {latency['p99']} ms  errors {result['errors']}")
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait(timeout=10)
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": git_commit(),
+        "config": {
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "warmup": args.warmup,
+            "textLength": args.text_length,
+            "versions": args.versions,
+            "batchSize": args.batch_size,
+            "startedServices": sorted(to_start),
+            "workers": args.workers,
+            "apiEnv": args.api_env,
+        },
+        "results": results,
+    }
+
+    output = Path(args.output) if args.output else (
+        Path(__file__).resolve().parent / "results"
+        / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
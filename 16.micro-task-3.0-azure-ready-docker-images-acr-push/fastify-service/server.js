@@ -54,6 +54,7 @@ fastify.addHook("onRequest", async (request, reply) => {
 
   // Attach to request object so handlers and other hooks can use it
   request.requestId = requestId;
+  request.startTime = process.hrtime.bigint();
 
   // Also echo back to client
   reply.header("x-request-id", requestId);
@@ -69,6 +70,30 @@ fastify.addHook("onRequest", async (request, reply) => {
   );
 });
 
+// -----------------------------------------------------------------------------
+// Server-Timing: forward the Python API's per-stage timings and append the
+// upstream call duration, plus the gateway's own total (onSend hook below)
+// -----------------------------------------------------------------------------
+function elapsedMs(startNs) {
+  return (Number(process.hrtime.bigint() - startNs) / 1e6).toFixed(3);
+}
+
+function forwardServerTiming(reply, pythonResponse, upstreamStart) {
+  const upstreamTiming = pythonResponse.headers.get("server-timing");
+  const entries = upstreamTiming ? [upstreamTiming] : [];
+  entries.push(`upstream;dur=${elapsedMs(upstreamStart)}`);
+  reply.header("server-timing", entries.join(", "));
+}
+
+fastify.addHook("onSend", async (request, reply, payload) => {
+  if (request.startTime !== undefined) {
+    const existing = reply.getHeader("server-timing");
+    const gateway = `gateway;dur=${elapsedMs(request.startTime)}`;
+    reply.header("server-timing", existing ? `${existing}, ${gateway}` : gateway);
+  }
+  return payload;
+});
+
 // -----------------------------------------------------------------------------
 // Hook: API key authentication for protected routes
 // -----------------------------------------------------------------------------
@@ -205,6 +230,7 @@ fastify.post("/predict", async (request, reply) => {
       "Calling Python API /predict"
     );
 
+    const upstreamStart = process.hrtime.bigint();
     const pythonResponse = await fetch(`${PYTHON_API_BASE_URL}/predict`, {
       method: "POST",
       headers: {
@@ -213,6 +239,7 @@ fastify.post("/predict", async (request, reply) => {
       },
       body: JSON.stringify(payload)
     });
+    forwardServerTiming(reply, pythonResponse, upstreamStart);
 
     if (!pythonResponse.ok) {
       const errorBody = await pythonResponse.text();
@@ -285,12 +312,14 @@ fastify.get("/admin/models", async (request, reply) => {
       "Calling Python API /models"
     );
 
+    const upstreamStart = process.hrtime.bigint();
     const pythonResponse = await fetch(`${PYTHON_API_BASE_URL}/models`, {
       method: "GET",
       headers: {
         "X-Request-Id": requestId
       }
     });
+    forwardServerTiming(reply, pythonResponse, upstreamStart);
 
     if (!pythonResponse.ok) {
       const errorBody = await pythonResponse.text();
@@ -364,6 +393,7 @@ fastify.get("/admin/models/latest", async (request, reply) => {
       "Calling Python API /models/latest"
     );
 
+    const upstreamStart = process.hrtime.bigint();
     const pythonResponse = await fetch(
       `${PYTHON_API_BASE_URL}/models/latest`,
       {
@@ -373,6 +403,7 @@ fastify.get("/admin/models/latest", async (request, reply) => {
         }
       }
     );
+    forwardServerTiming(reply, pythonResponse, upstreamStart);
 
     if (!pythonResponse.ok) {
       const errorBody = await pythonResponse.text();
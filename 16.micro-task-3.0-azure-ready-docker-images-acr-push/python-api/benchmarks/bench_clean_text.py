@@ -0,0 +1,70 @@
+# bench_clean_text.py - Microbenchmark: clean_text fast path vs original implementation
+#
+# Usage (from python-api/):
+#   python benchmarks/bench_clean_text.py [--docs 20000] [--repeat 5]
+
+import argparse
+import random
+import re
+import string
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from text_utils import clean_text, clean_texts  # noqa: E402
+
+
+def clean_text_reference(text: str) -> str:
+    """The original implementation (lower + two uncompiled re.sub calls)."""
+    text = text.lower()
+    text = re.sub(r"[^a-z0-9\s]", "", text)
+    text = re.sub(r"\s+", " ", text).strip()
+    return text
+
+
+def make_docs(n_docs: int, seed: int = 42):
+    rng = random.Random(seed)
+    words = ["great", "terrible", "Product", "service", "LOVE", "hate", "ok",
+             "it's", "really", "not", "good", "at", "all", "1080p", "5/5"]
+    punct = ["", "", "", ",", ".", "!", "!!!", "?", " :)", "..."]
+    docs = []
+    for _ in range(n_docs):
+        n_words = rng.randint(3, 80)
+        docs.append(" ".join(rng.choice(words) + rng.choice(punct) for _ in range(n_words)))
+    # Some non-ASCII text to exercise the regex path
+    docs += ["Café crème — très BON!! " + rng.choice(string.ascii_letters) for _ in range(n_docs // 20)]
+    return docs
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    docs = make_docs(args.docs)
+
+    # Correctness: the fast path must produce identical output
+    mismatches = [d for d in docs if clean_text(d) != clean_text_reference(d)]
+    if mismatches:
+        raise SystemExit(f"clean_text output differs for {len(mismatches)} docs, e.g. {mismatches[0]!r}")
+
+    candidates = {
+        "reference (re.sub x2)": lambda: [clean_text_reference(d) for d in docs],
+        "clean_text": lambda: [clean_text(d) for d in docs],
+        "clean_texts (batch)": lambda: clean_texts(docs),
+    }
+
+    print(f"{len(docs)} docs, best of {args.repeat} runs")
+    baseline = None
+    for name, fn in candidates.items():
+        best = min(timeit.repeat(fn, number=1, repeat=args.repeat))
+        baseline = baseline or best
+        per_doc_us = best / len(docs) * 1e6
+        print(f"  {name:<24} {best * 1000:8.1f} ms  {per_doc_us:6.2f} us/doc  x{baseline / best:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# bench_compression.py - Artifact size / dump time / load time per joblib codec
+#
+# Usage (from python-api/):
+#   python benchmarks/bench_compression.py 1.1.0 [--root registry] [--repeat 3]
+#   python benchmarks/bench_compression.py 1.1.0 --codecs none zlib:1 zlib:6 lzma:9
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import joblib
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from registry import COMPRESSION_CODECS, ModelRegistry, joblib_compress_arg  # noqa: E402
+
+DEFAULT_CODECS = ["none", "zlib:1", "zlib:3", "zlib:9", "gzip:3", "bz2:3", "lzma:3", "lz4:3"]
+
+
+def parse_codec(spec: str):
+    codec, _, level = spec.partition(":")
+    return codec, int(level) if level else 3
+
+
+def time_best(fn, repeat: int):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("version", help="registry version to re-encode")
+    parser.add_argument("--root", type=str, default="registry")
+    parser.add_argument("--codecs", nargs="*", default=DEFAULT_CODECS,
+                        help=f"codec[:level] list, codecs: {', '.join(COMPRESSION_CODECS)}")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    registry = ModelRegistry(args.root)
+    model, metadata = registry.get_joblib_model(args.version)
+    current = metadata.get("compression", {"codec": "none", "level": None})
+
+    print(f"version {args.version} (saved with {current['codec']}"
+          f"{':' + str(current['level']) if current.get('level') else ''}), "
+          f"best of {args.repeat} runs; loads hit the page cache")
+    print(f"  {'codec':<10} {'size KB':>10} {'ratio':>7} {'dump ms':>10} {'load ms':>10}")
+
+    baseline_size = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for spec in args.codecs:
+            codec, level = parse_codec(spec)
+            try:
+                compress = joblib_compress_arg(codec, level)
+            except ValueError as ex:
+                print(f"  {spec:<10} skipped: {ex}")
+                continue
+
+            path = Path(tmp) / f"model-{codec}-{level}.joblib"
+            dump_s = time_best(lambda: joblib.dump(model, path, compress=compress), args.repeat)
+            load_s = time_best(lambda: joblib.load(path), args.repeat)
+
+            size = path.stat().st_size
+            baseline_size = baseline_size or size
+            label = codec if codec == "none" else f"{codec}:{level}"
+            print(f"  {label:<10} {size / 1024:10.1f} {baseline_size / size:6.2f}x "
+                  f"{dump_s * 1000:10.1f} {load_s * 1000:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+# bench_hot_paths.py - Microbenchmarks for the inference and training hot paths
+#
+# Usage (from python-api/):
+#   python benchmarks/bench_hot_paths.py                      # everything, default sizes
+#   python benchmarks/bench_hot_paths.py --docs 50000 --vocab 30000
+#   python benchmarks/bench_hot_paths.py --only predict,registry --output /tmp/bench.json
+#   python benchmarks/bench_hot_paths.py --only grid --grid-sizes 1000,10000,50000 --n-jobs -1
+#
+# All data is synthetic (Zipf-distributed vocabulary, log-normal document
+# lengths, sentiment words driving the labels), sized by --docs / --vocab so
+# results reflect production-scale corpora rather than the 10-sentence toy set.
+
+import argparse
+import json
+import random
+import shutil
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import GridSearchCV
+from sklearn.pipeline import Pipeline
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from compiled_model import export_pipeline  # noqa: E402
+from registry import ModelRegistry  # noqa: E402
+from text_utils import clean_text, clean_texts  # noqa: E402
+
+POSITIVE = ["great", "love", "fantastic", "excellent", "enjoyable", "nice", "perfect", "recommend"]
+NEGATIVE = ["terrible", "hate", "awful", "bad", "disappointing", "broken", "refund", "worst"]
+PUNCT = ["", "", "", "", ",", ".", "!", "!!", "?", "..."]
+
+# Same grid as 09.micro-task-1.6-model-registry-basics/train.py
+PARAM_GRID = {
+    "clf__C": [0.1, 1.0, 10.0],
+    "clf__max_iter": [500, 1000, 2000],
+}
+
+SECTIONS = ("clean", "transform", "predict", "registry", "grid")
+
+
+# -----------------------------------------------------------------------------
+# Synthetic data
+# -----------------------------------------------------------------------------
+def make_vocabulary(size: int, rng):
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(letters) for _ in range(rng.randint(3, 10))))
+    return sorted(words)
+
+
+def make_corpus(n_docs: int, vocab_size: int = 20000, seed: int = 42):
+    """
+    (texts, labels): Zipf-distributed filler words, log-normal lengths
+    (median ~20 words), a few sentiment words per document deciding the
+    label, 10% label noise, mixed case and punctuation for clean_text.
+    """
+    rng = random.Random(seed)
+    np_rng = np.random.default_rng(seed)
+    vocab = make_vocabulary(vocab_size, rng)
+
+    texts, labels = [], []
+    for _ in range(n_docs):
+        length = max(3, int(rng.lognormvariate(3.0, 0.6)))
+        ranks = np.minimum(np_rng.zipf(1.3, size=length), vocab_size) - 1
+        words = [vocab[r] for r in ranks]
+
+        label = rng.choice(["positive", "negative"])
+        sentiment = POSITIVE if label == "positive" else NEGATIVE
+        for _ in range(rng.randint(1, 3)):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(sentiment))
+        if rng.random() < 0.1:
+            label = "negative" if label == "positive" else "positive"
+
+        texts.append(" ".join(
+            (w.upper() if rng.random() < 0.05 else w) + rng.choice(PUNCT) for w in words
+        ))
+        labels.append(label)
+    return texts, labels
+
+
+def build_model():
+    return Pipeline([
+        ("tfidf", TfidfVectorizer(preprocessor=clean_text)),
+        ("clf", LogisticRegression(max_iter=1000)),
+    ])
+
+
+# -----------------------------------------------------------------------------
+# Timing helpers
+# -----------------------------------------------------------------------------
+class Report:
+    def __init__(self, repeat: int):
+        self.repeat = repeat
+        self.results = []
+
+    def time(self, name: str, fn, items: int = 1, number: int = 1, repeat: int = None):
+        """Best of `repeat` runs of `number` calls; reports ms/call and us/item."""
+        best = min(timeit.repeat(fn, number=number, repeat=repeat or self.repeat)) / number
+        self.add(name, best, items)
+
+    def add(self, name: str, seconds: float, items: int = 1):
+        result = {
+            "name": name,
+            "ms": round(seconds * 1000, 4),
+            "items": items,
+            "usPerItem": round(seconds / items * 1e6, 3),
+        }
+        self.results.append(result)
+        print(f"  {name:<50} {result['ms']:>11.3f} ms  {result['usPerItem']:>10.2f} us/item")
+
+
+# -----------------------------------------------------------------------------
+# Benchmarks
+# -----------------------------------------------------------------------------
+def bench_clean(report, texts):
+    print(f"clean_text ({len(texts)} docs)")
+    report.time("clean_text (per call, loop)", lambda: [clean_text(t) for t in texts], len(texts))
+    report.time("clean_texts (batch)", lambda: clean_texts(texts), len(texts))
+
+
+def bench_transform(report, model, texts):
+    vectorizer = model.named_steps["tfidf"]
+    print(f"TfidfVectorizer.transform ({len(vectorizer.vocabulary_)} features)")
+    report.time("transform 1 doc", lambda: vectorizer.transform(texts[:1]), 1, number=200)
+    report.time("transform 512 docs", lambda: vectorizer.transform(texts[:512]), 512)
+    report.time(f"transform {len(texts)} docs", lambda: vectorizer.transform(texts), len(texts))
+
+
+def bench_predict(report, model, texts):
+    clf = model.named_steps["clf"]
+    X_one = model.named_steps["tfidf"].transform(texts[:1])
+    X_batch = model.named_steps["tfidf"].transform(texts[:512])
+    compiled = export_pipeline(model)
+
+    print("LogisticRegression / end-to-end predict")
+    report.time("clf.predict 1 row", lambda: clf.predict(X_one), 1, number=500)
+    report.time("clf.predict 512 rows", lambda: clf.predict(X_batch), 512, number=20)
+    report.time("clf.predict_proba 1 row", lambda: clf.predict_proba(X_one), 1, number=500)
+    report.time("clf.predict_proba 512 rows", lambda: clf.predict_proba(X_batch), 512, number=20)
+    report.time("pipeline.predict 1 text", lambda: model.predict(texts[:1]), 1, number=200)
+    report.time("pipeline.predict 512 texts", lambda: model.predict(texts[:512]), 512)
+    report.time("compiled.predict 1 text", lambda: compiled.predict(texts[:1]), 1, number=200)
+    report.time("compiled.predict 512 texts", lambda: compiled.predict(texts[:512]), 512)
+
+
+def bench_registry(report, model, n_versions: int):
+    root = Path(tempfile.mkdtemp(prefix="bench-registry-"))
+    try:
+        registry = ModelRegistry(root)
+        registry.save_model("1.0.0", model, {"version": "1.0.0"})
+
+        print("ModelRegistry.get_model (cold = fresh registry, empty model cache)")
+        for label, compiled_versions in (("joblib", ""), ("compiled", "*")):
+            report.time(
+                f"get_model cold ({label})",
+                lambda: ModelRegistry(root, compiled_versions=compiled_versions).get_model("1.0.0"),
+            )
+            warm = ModelRegistry(root, compiled_versions=compiled_versions)
+            warm.get_model("1.0.0")
+            report.time(f"get_model warm ({label})", lambda: warm.get_model("1.0.0"), number=1000)
+
+        # Many versions: metadata-only directories are enough for listing
+        for i in range(n_versions):
+            version_dir = root / "versions" / f"2.{i // 100}.{i % 100}"
+            version_dir.mkdir(parents=True, exist_ok=True)
+            (version_dir / "metadata.json").write_text(json.dumps({"version": version_dir.name}))
+
+        print(f"ModelRegistry.list_versions ({n_versions + 1} versions)")
+
+        def cold_list():
+            (root / "index.json").unlink(missing_ok=True)
+            ModelRegistry(root).list_versions()
+
+        report.time("list_versions cold (rebuild index.json)", cold_list)
+        report.time("list_versions fresh registry (index.json on disk)",
+                    lambda: ModelRegistry(root).list_versions())
+        warm = ModelRegistry(root)
+        warm.list_versions()
+        report.time("list_versions warm (in-memory index)", warm.list_versions, number=1000)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def bench_grid(report, sizes, vocab_size: int, n_jobs, seed: int):
+    candidates = len(PARAM_GRID["clf__C"]) * len(PARAM_GRID["clf__max_iter"])
+    print(f"GridSearchCV ({candidates} candidates x 5 folds, n_jobs={n_jobs})")
+    for size in sizes:
+        texts, labels = make_corpus(size, vocab_size, seed)
+        grid = GridSearchCV(build_model(), PARAM_GRID, cv=5, scoring="accuracy", n_jobs=n_jobs)
+        report.time(f"GridSearchCV.fit {size} docs", lambda: grid.fit(texts, labels), size, repeat=1)
+
+
+# -----------------------------------------------------------------------------
+# Main
+# -----------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=20000, help="synthetic corpus size")
+    parser.add_argument("--vocab", type=int, default=20000, help="synthetic vocabulary size")
+    parser.add_argument("--versions", type=int, default=500, help="registry versions for list_versions")
+    parser.add_argument("--grid-sizes", type=str, default="1000,4000,16000")
+    parser.add_argument("--n-jobs", type=int, default=None, help="GridSearchCV n_jobs")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--only", type=str, default=",".join(SECTIONS),
+                        help=f"comma-separated subset of: {', '.join(SECTIONS)}")
+    parser.add_argument("--output", type=str, default=None, help="write results as JSON")
+    args = parser.parse_args()
+
+    sections = {s.strip() for s in args.only.split(",") if s.strip()}
+    report = Report(args.repeat)
+
+    texts, labels = make_corpus(args.docs, args.vocab, args.seed)
+    model = None
+    if sections & {"transform", "predict", "registry"}:
+        model = build_model().fit(texts, labels)
+
+    if "clean" in sections:
+        bench_clean(report, texts)
+    if "transform" in sections:
+        bench_transform(report, model, texts)
+    if "predict" in sections:
+        bench_predict(report, model, texts)
+    if "registry" in sections:
+        bench_registry(report, model, args.versions)
+    if "grid" in sections:
+        sizes = [int(s) for s in args.grid_sizes.split(",") if s]
+        bench_grid(report, sizes, args.vocab, args.n_jobs, args.seed)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps({
+            "config": vars(args),
+            "results": report.results,
+        }, indent=2))
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,362 @@
+# compiled_model.py - sklearn-free scorer for TF-IDF + LogisticRegression pipelines
+
+import json
+import os
+import re
+from pathlib import Path
+
+import numpy as np
+from scipy import sparse
+from scipy.special import expit
+
+from text_utils import clean_text, tokenize, word_ngrams
+
+
+COMPILED_FORMAT = "tfidf-logreg/1"
+HEADER_FILE = "header.json"
+ARRAY_FILES = ("terms", "term_ids", "idf", "coef", "intercept", "classes")
+
+# Inputs check_matches() always scores (punctuation, case, empty and
+# out-of-vocabulary text), in addition to texts built from the vocabulary
+CHECK_TEXTS = [
+    "this is great",
+    "I love this product!!!",
+    "really bad service, not good at all",
+    "Absolutely FANTASTIC experience... quite enjoyable",
+    "",
+    "words the model has never seen before",
+]
+
+
+class CompiledLinearModel:
+    """
+    Flattened TfidfVectorizer(preprocessor=clean_text) + LogisticRegression.
+
+    Arrays:
+      terms      - vocabulary terms, sorted (for np.searchsorted lookup)
+      term_ids   - feature id of each entry in `terms`
+      idf        - IDF weight per feature id
+      coef       - (n_rows, n_features) LogisticRegression coefficients
+      intercept  - (n_rows,) LogisticRegression intercepts
+      classes    - class labels
+
+    A batch is vectorized into one CSR matrix and scored with one sparse
+    matrix product, following the exact operation order of sklearn (sorted
+    CSR indices, sequential row norms and dot products), so predictions,
+    decision scores and probabilities match the original pipeline
+    bit-for-bit.
+    """
+
+    def __init__(self, header: dict, arrays: dict):
+        self.header = header
+        self.terms = arrays["terms"]
+        self.term_ids = arrays["term_ids"]
+        self.idf = arrays["idf"]
+        self.coef = arrays["coef"]
+        self.intercept = arrays["intercept"]
+        self.classes_ = arrays["classes"]
+
+        self._token_re = re.compile(header["token_pattern"])
+        self._ngram_range = tuple(header["ngram_range"])
+        stop_words = header.get("stop_words")
+        self._stop_words = frozenset(stop_words) if stop_words is not None else None
+        self._ones_vector = None
+
+    # -------------------------------------------------------------------------
+    # Feature extraction (mirrors TfidfVectorizer.transform)
+    # -------------------------------------------------------------------------
+    def _ones(self):
+        if self._ones_vector is None:
+            self._ones_vector = np.ones(len(self.idf))
+        return self._ones_vector
+
+    def analyze(self, text: str, cleaned: str = None):
+        """
+        clean_text -> token_pattern -> stop words -> word n-grams
+        (`cleaned` = clean_text(text), when the caller already has it).
+        """
+        tokens = tokenize(text, self._token_re, cleaned)
+        return word_ngrams(tokens, self._stop_words, self._ngram_range)
+
+    def transform(self, texts, cleaned=None):
+        """
+        TF-IDF matrix of `texts` (CSR, sorted indices) built for the whole
+        batch at once; feed it to decision_function_rows() / predict_rows()
+        to score. `cleaned` may pass in clean_texts(texts).
+        """
+        n_docs = len(texts)
+        n_features = len(self.idf)
+        if cleaned is None:
+            cleaned = [None] * n_docs
+
+        tokens, lengths = [], []
+        for text, cleaned_text in zip(texts, cleaned):
+            doc_tokens = self.analyze(text, cleaned_text)
+            tokens.extend(doc_tokens)
+            lengths.append(len(doc_tokens))
+
+        if tokens and len(self.terms):
+            token_arr = np.asarray(tokens)
+            pos = np.searchsorted(self.terms, token_arr)
+            pos[pos == len(self.terms)] = 0
+            known = self.terms[pos] == token_arr
+
+            # One (document, feature id) key per known token; np.unique
+            # sorts them by document, then feature id, and counts them
+            docs = np.repeat(np.arange(n_docs, dtype=np.int64), lengths)[known]
+            keys, counts = np.unique(docs * n_features + self.term_ids[pos[known]],
+                                     return_counts=True)
+        else:
+            keys = np.empty(0, dtype=np.int64)
+            counts = np.empty(0, dtype=np.int64)
+
+        docs, ids = np.divmod(keys, n_features)
+        indptr = np.zeros(n_docs + 1, dtype=np.int64)
+        np.cumsum(np.bincount(docs, minlength=n_docs), out=indptr[1:])
+
+        values = counts.astype(np.float64)
+        if self.header["binary"]:
+            values.fill(1.0)
+        if self.header["sublinear_tf"]:
+            np.log(values, values)
+            values += 1.0
+
+        values *= self.idf[ids]
+
+        norm = self.header["norm"]
+        if norm is not None and len(values):
+            # Row sums via a CSR matvec: it accumulates each row sequentially,
+            # like sklearn's Cython normalize loop (np.sum would not)
+            terms = values * values if norm == "l2" else np.abs(values)
+            totals = sparse.csr_matrix((terms, ids, indptr), shape=(n_docs, n_features)) \
+                @ self._ones()
+            if norm == "l2":
+                np.sqrt(totals, totals)
+            totals[totals == 0.0] = 1.0  # sklearn leaves all-zero rows as they are
+            values /= np.repeat(totals, np.diff(indptr))
+
+        return sparse.csr_matrix((values, ids, indptr), shape=(n_docs, n_features))
+
+    # -------------------------------------------------------------------------
+    # Scoring (mirrors LogisticRegression)
+    # -------------------------------------------------------------------------
+    def decision_function(self, texts):
+        return self.decision_function_rows(self.transform(texts))
+
+    def decision_function_rows(self, rows):
+        """Decision scores for a matrix returned by transform()."""
+        # One CSR matvec per class over a contiguous coefficient row: the
+        # same per-row summation order as sklearn's X @ coef_.T, without
+        # copying a transposed (memory-mapped) coefficient matrix per call
+        scores = np.empty((rows.shape[0], self.coef.shape[0]), dtype=np.float64)
+        for k, coef_row in enumerate(self.coef):
+            scores[:, k] = rows @ coef_row
+        scores += self.intercept
+
+        if scores.shape[1] == 1:
+            return scores.reshape(-1)
+        return scores
+
+    def predict(self, texts):
+        return self.predict_rows(self.transform(texts))
+
+    def predict_rows(self, rows):
+        scores = self.decision_function_rows(rows)
+        if scores.ndim == 1:
+            indices = (scores > 0).astype(int)
+        else:
+            indices = scores.argmax(axis=1)
+        return self.classes_[indices]
+
+    def predict_proba(self, texts):
+        scores = self.decision_function(texts)
+        mode = self.header["proba"]
+
+        if mode == "binary":
+            prob = expit(scores)
+            return np.stack([1 - prob, prob], axis=1)
+
+        if mode == "ovr":
+            prob = expit(scores)
+            prob_sum = prob.sum(axis=1)
+            all_zero = prob_sum == 0
+            if np.any(all_zero):
+                prob[all_zero, :] = 1
+                prob_sum[all_zero] = prob.shape[1]
+            prob /= prob_sum.reshape((prob.shape[0], -1))
+            return prob
+
+        # multinomial: softmax, as in sklearn.utils.extmath.softmax; a binary
+        # multinomial model has one score d per text and softmaxes [-d, d]
+        if scores.ndim == 1:
+            scores = np.c_[-scores, scores]
+        scores -= scores.max(axis=1).reshape((-1, 1))
+        np.exp(scores, scores)
+        scores /= scores.sum(axis=1).reshape((-1, 1))
+        return scores
+
+    # -------------------------------------------------------------------------
+    # Persistence: <dir>/header.json + one .npy file per array
+    # -------------------------------------------------------------------------
+    def save(self, directory):
+        """
+        Write header.json + <name>.npy files.
+
+        Each file is written to a temp name and moved into place with
+        os.replace, so processes that still have the previous arrays
+        memory-mapped keep reading the old (unlinked) inode safely.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        arrays = {
+            "terms": self.terms,
+            "term_ids": self.term_ids,
+            "idf": self.idf,
+            "coef": self.coef,
+            "intercept": self.intercept,
+            "classes": self.classes_,
+        }
+        for name in ARRAY_FILES:
+            tmp_path = directory / f"{name}.npy.tmp"
+            with open(tmp_path, "wb") as f:
+                np.save(f, np.asarray(arrays[name]), allow_pickle=False)
+            os.replace(tmp_path, directory / f"{name}.npy")
+
+        # Header last: readers use its presence/mtime as "artifact complete"
+        tmp_header = directory / f"{HEADER_FILE}.tmp"
+        tmp_header.write_text(json.dumps(self.header, indent=2))
+        os.replace(tmp_header, directory / HEADER_FILE)
+
+    @classmethod
+    def load(cls, directory, mmap: bool = False):
+        """
+        Load a saved model. With mmap=True the large arrays (vocabulary,
+        IDF, coefficients) are opened read-only with np.load(mmap_mode="r")
+        instead of being read into private memory.
+        """
+        directory = Path(directory)
+        header = json.loads((directory / HEADER_FILE).read_text())
+        if header.get("format") != COMPILED_FORMAT:
+            raise ValueError(f"Unsupported compiled model format: {header.get('format')}")
+
+        mmap_mode = "r" if mmap else None
+        arrays = {
+            name: np.load(directory / f"{name}.npy", mmap_mode=mmap_mode, allow_pickle=False)
+            for name in ARRAY_FILES
+        }
+        # Tiny and returned to callers: keep as a regular in-memory array
+        arrays["classes"] = np.array(arrays["classes"])
+        return cls(header, arrays)
+
+
+# ------------------------------------------------------------------------------
+# Export from a fitted sklearn Pipeline
+# ------------------------------------------------------------------------------
+def export_pipeline(pipeline) -> CompiledLinearModel:
+    """
+    Flatten a fitted Pipeline([("tfidf", TfidfVectorizer(preprocessor=clean_text)),
+    ("clf", LogisticRegression(...))]) into a CompiledLinearModel.
+
+    Raises ValueError for pipelines this scorer cannot reproduce exactly.
+    """
+    steps = getattr(pipeline, "steps", None)
+    if not steps or len(steps) != 2:
+        raise ValueError("Expected a 2-step Pipeline (tfidf, clf)")
+
+    vectorizer = steps[0][1]
+    clf = steps[1][1]
+
+    preprocessor = getattr(vectorizer, "preprocessor", None)
+    if getattr(preprocessor, "__name__", None) != clean_text.__name__:
+        raise ValueError("Vectorizer must use preprocessor=clean_text")
+    if getattr(vectorizer, "analyzer", None) != "word" or vectorizer.tokenizer is not None:
+        raise ValueError("Only analyzer='word' with the default tokenizer is supported")
+    if not hasattr(vectorizer, "idf_") or not getattr(vectorizer, "use_idf", True):
+        raise ValueError("Vectorizer must be fitted with use_idf=True")
+    if np.dtype(vectorizer.dtype) != np.float64:
+        raise ValueError("Only dtype=float64 vectorizers are supported")
+    if not (hasattr(clf, "coef_") and hasattr(clf, "intercept_") and hasattr(clf, "classes_")):
+        raise ValueError("Classifier must be a fitted linear model")
+
+    vocabulary = vectorizer.vocabulary_
+    sorted_terms = sorted(vocabulary)
+    terms = np.array(sorted_terms, dtype=str)
+    term_ids = np.array([vocabulary[t] for t in sorted_terms], dtype=np.int64)
+
+    # How predict_proba turns scores into probabilities. sklearn versions
+    # that still have `multi_class` use softmax for "multinomial" (also for
+    # two classes, over [-d, d]) and one-vs-rest for "ovr" and liblinear;
+    # newer versions use expit for two classes and softmax otherwise.
+    classes = np.asarray(clf.classes_)
+    binary = len(classes) <= 2
+    multi_class = getattr(clf, "multi_class", None)
+    if multi_class == "multinomial":
+        proba = "multinomial"
+    elif multi_class in ("ovr", "warn") or (
+        multi_class in ("auto", "deprecated")
+        and getattr(clf, "solver", None) == "liblinear"
+    ):
+        proba = "binary" if binary else "ovr"
+    else:
+        proba = "binary" if binary else "multinomial"
+
+    stop_words = vectorizer.get_stop_words()
+
+    header = {
+        "format": COMPILED_FORMAT,
+        "token_pattern": vectorizer.token_pattern,
+        "ngram_range": list(vectorizer.ngram_range),
+        "stop_words": sorted(stop_words) if stop_words is not None else None,
+        "binary": bool(vectorizer.binary),
+        "sublinear_tf": bool(vectorizer.sublinear_tf),
+        "norm": vectorizer.norm,
+        "proba": proba,
+        "n_features": int(len(vocabulary)),
+    }
+    arrays = {
+        "terms": terms,
+        "term_ids": term_ids,
+        "idf": np.ascontiguousarray(vectorizer.idf_, dtype=np.float64),
+        "coef": np.ascontiguousarray(clf.coef_, dtype=np.float64),
+        "intercept": np.ascontiguousarray(clf.intercept_, dtype=np.float64),
+        "classes": classes,
+    }
+    return CompiledLinearModel(header, arrays)
+
+
+def vocabulary_texts(compiled: CompiledLinearModel, n_texts: int = 32, words: int = 12):
+    """
+    Deterministic texts made of terms spread over the whole vocabulary (with
+    repeats and mixed case), so check_matches() exercises real features.
+    """
+    n_terms = len(compiled.terms)
+    if n_terms == 0:
+        return []
+    step = max(1, n_terms // (n_texts * words))
+    texts = []
+    for i in range(n_texts):
+        start = (i * words * step) % n_terms
+        terms = [str(compiled.terms[(start + j * step) % n_terms]) for j in range(words)]
+        terms += terms[: i % 4]
+        texts.append(" ".join(t.upper() if j % 5 == 0 else t for j, t in enumerate(terms)))
+    return texts
+
+
+def check_matches(pipeline, compiled: CompiledLinearModel, texts=None):
+    """
+    Raise ValueError unless `compiled` reproduces the pipeline's decision
+    scores, predictions and probabilities exactly for `texts` (default:
+    CHECK_TEXTS plus vocabulary_texts(compiled)).
+    """
+    if texts is None:
+        texts = CHECK_TEXTS + vocabulary_texts(compiled)
+    texts = list(texts)
+    checks = [
+        ("decision scores", pipeline.decision_function, compiled.decision_function),
+        ("predictions", pipeline.predict, compiled.predict),
+        ("probabilities", pipeline.predict_proba, compiled.predict_proba),
+    ]
+    for name, expected, actual in checks:
+        if not np.array_equal(expected(texts), actual(texts)):
+            raise ValueError(f"Compiled {name} differ from sklearn pipeline")
@@ -0,0 +1,26 @@
+# export_compiled.py - Export registry versions to the sklearn-free compiled scorer
+
+import argparse
+
+from registry import ModelRegistry
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("versions", nargs="*", help="versions to export (default: all)")
+    parser.add_argument("--root", type=str, default="registry")
+    args = parser.parse_args()
+
+    registry = ModelRegistry(args.root)
+    versions = args.versions or registry.list_versions()
+
+    for version in versions:
+        # Raises before anything is linked unless the export reproduces the
+        # sklearn pipeline exactly
+        compiled = registry.export_compiled(version)
+        print(f"[export] {version}: {compiled.header['n_features']} features, "
+              f"outputs match sklearn pipeline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+# inference_pool.py - Process-pool inference backend (one model copy per worker process)
+
+import itertools
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+logger = logging.getLogger("python-api")
+
+
+# -----------------------------------------------------------------------------
+# Worker process
+# -----------------------------------------------------------------------------
+def _worker_main(conn, root, compiled_versions, preload_versions, warm_predictions,
+                 cache_size, cache_bytes):
+    """
+    Worker loop: preload + warm models, report readiness, then answer
+    (request_id, version, method, texts) messages until told to stop (None).
+    The "reload" method (texts = (force,)) reloads + warms a re-published
+    version if it is loaded here (always with force) and returns whether
+    it did.
+
+    The worker's model cache uses the API's limits; preloaded versions are
+    pinned in it, as in the API process.
+    """
+    # Shutdown is driven by the API process, not by the terminal's Ctrl-C
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    from registry import ModelRegistry
+    from warmup import warm_model
+
+    registry = ModelRegistry(root, cache_size=cache_size, compiled_versions=compiled_versions,
+                             cache_bytes=cache_bytes, pinned_versions=preload_versions)
+
+    def get_model(version):
+        if version is None:
+            return registry.get_latest_model()[0]
+        return registry.get_model(version)[0]
+
+    def reload(version, force):
+        if not (force or registry.is_loaded(version)):
+            return False
+        warm_model(get_model(version), warm_predictions)
+        return True
+
+    start = time.perf_counter()
+    latest = registry.get_latest_version() if registry.list_versions() else None
+    targets = list(dict.fromkeys([latest, *preload_versions]))
+
+    errors = {}
+    for version in targets:
+        try:
+            warm_model(get_model(version), warm_predictions)
+        except Exception as ex:
+            errors[version or "latest"] = str(ex)
+
+    conn.send(("ready", {
+        "pid": os.getpid(),
+        "versions": [v or "latest" for v in targets],
+        "startupMs": round((time.perf_counter() - start) * 1000, 2),
+        "errors": errors,
+    }))
+
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+        if message is None:
+            break
+
+        request_id, version, method, texts = message
+        try:
+            if method == "reload":
+                result = reload(version, *texts)
+            else:
+                result = np.asarray(getattr(get_model(version), method)(texts)).tolist()
+            conn.send((request_id, True, result))
+        except Exception as ex:
+            conn.send((request_id, False, (type(ex).__name__, str(ex))))
+
+
+# -----------------------------------------------------------------------------
+# API side
+# -----------------------------------------------------------------------------
+class InferenceWorkerError(RuntimeError):
+    """A prediction failed inside a worker process (or the worker died)."""
+
+
+class _WorkerHandle:
+    """Pipe, process, in-flight requests and reader thread for one worker."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.process = None
+        self.conn = None
+        self.send_lock = threading.Lock()
+        self.pending = {}
+        self.info = None
+        self.ready = False
+        self.restarts = 0
+        self.requests = 0
+
+
+class PooledModel:
+    """
+    Stand-in for a loaded model that scores in the inference pool.
+
+    Exposes predict() / predict_proba() with the same return types as the
+    sklearn pipeline, so the micro-batcher and batch endpoint use it as-is.
+    """
+
+    def __init__(self, pool, version):
+        self.pool = pool
+        self.version = version
+
+    def predict(self, texts):
+        return np.asarray(self.pool.run(self.version, "predict", list(texts)))
+
+    def predict_proba(self, texts):
+        return np.asarray(self.pool.run(self.version, "predict_proba", list(texts)))
+
+    def submit(self, method: str, texts) -> Future:
+        """Non-blocking `method(texts)`; the Future's result is a list of rows."""
+        return self.pool.submit(self.version, method, list(texts))
+
+
+class InferencePool:
+    """
+    Runs predictions in `workers` long-lived worker processes.
+
+    - Each worker opens its own ModelRegistry on `root` (model cache bounded
+      by `cache_size` / `cache_bytes`), preloads and warms the latest
+      version plus `preload_versions` (pinned in its cache) at startup, and
+      then serves requests; models stay loaded between requests.
+    - Texts and results travel over one multiprocessing Pipe per worker;
+      each request goes to the worker with the fewest requests in flight.
+    - Scoring (clean_text, vectorizer, classifier) runs outside the API
+      process, so one API process uses up to `workers` cores while its
+      threads only wait on pipes (the GIL is released while waiting).
+    - A worker that dies fails its in-flight requests and is restarted.
+    - reload() tells every worker that a version was re-published, so the
+      registry watcher warms new artifacts where requests are scored.
+    """
+
+    def __init__(self, root: str = "registry", workers: int = None,
+                 compiled_versions="*", preload_versions=(), warm_predictions: int = 3,
+                 cache_size: int = 8, cache_bytes: int = None, start_method: str = "spawn"):
+        self.root = str(root)
+        self.workers = workers or os.cpu_count() or 1
+        self.compiled_versions = compiled_versions
+        self.preload_versions = [v for v in preload_versions if v]
+        self.warm_predictions = warm_predictions
+        self.cache_size = cache_size
+        self.cache_bytes = cache_bytes
+        self._ctx = multiprocessing.get_context(start_method)
+
+        self._handles = [_WorkerHandle(i) for i in range(self.workers)]
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._models = {}
+        self._closed = False
+        self.started_at = None
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+    def start(self):
+        """Fork/spawn every worker; readiness is reported via status()."""
+        self.started_at = time.time()
+        for handle in self._handles:
+            self._spawn(handle)
+
+    def _spawn(self, handle: _WorkerHandle):
+        parent_conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(child_conn, self.root, self.compiled_versions,
+                  self.preload_versions, self.warm_predictions,
+                  self.cache_size, self.cache_bytes),
+            name=f"inference-worker-{handle.index}",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+
+        handle.process = process
+        handle.conn = parent_conn
+        handle.ready = False
+        threading.Thread(
+            target=self._read, args=(handle, parent_conn),
+            name=f"inference-reader-{handle.index}", daemon=True,
+        ).start()
+
+    def close(self):
+        self._closed = True
+        for handle in self._handles:
+            try:
+                with handle.send_lock:
+                    handle.conn.send(None)
+            except (OSError, AttributeError):
+                pass
+        for handle in self._handles:
+            if handle.process is not None:
+                handle.process.join(timeout=5)
+                if handle.process.is_alive():
+                    handle.process.terminate()
+
+    # -------------------------------------------------------------------------
+    # Requests
+    # -------------------------------------------------------------------------
+    def model(self, version):
+        """PooledModel for `version` (None = registry latest alias)."""
+        with self._lock:
+            model = self._models.get(version)
+            if model is None:
+                model = self._models[version] = PooledModel(self, version)
+            return model
+
+    def submit(self, version, method: str, texts) -> Future:
+        if self._closed:
+            raise InferenceWorkerError("inference pool is closed")
+
+        with self._lock:
+            candidates = [h for h in self._handles if h.ready] or self._handles
+            handle = min(candidates, key=lambda h: len(h.pending))
+            handle.requests += 1
+        return self._send(handle, version, method, texts)
+
+    def _send(self, handle: _WorkerHandle, version, method: str, texts) -> Future:
+        future = Future()
+        request_id = next(self._ids)
+        with self._lock:
+            handle.pending[request_id] = future
+
+        try:
+            with handle.send_lock:
+                handle.conn.send((request_id, version, method, texts))
+        except (OSError, ValueError) as ex:
+            with self._lock:
+                handle.pending.pop(request_id, None)
+            raise InferenceWorkerError(f"worker {handle.index} unavailable: {ex}") from ex
+        return future
+
+    def run(self, version, method: str, texts):
+        """Score `texts` in a worker and block until the result is back."""
+        return self.submit(version, method, texts).result()
+
+    def reload(self, version: str, force: bool = False):
+        """
+        Reload + warm `version` in every worker that has it loaded (in all
+        of them with `force`, e.g. for a new latest version) and wait for
+        them. Returns how many workers reloaded it; raises
+        InferenceWorkerError if any worker failed to.
+        """
+        if self._closed:
+            raise InferenceWorkerError("inference pool is closed")
+
+        futures = [self._send(h, version, "reload", (force,)) for h in self._handles]
+        errors = []
+        reloaded = 0
+        for future in futures:
+            try:
+                reloaded += bool(future.result())
+            except InferenceWorkerError as ex:
+                errors.append(str(ex))
+        if errors:
+            raise InferenceWorkerError(f"reload of {version} failed: {'; '.join(errors)}")
+        return reloaded
+
+    def _read(self, handle: _WorkerHandle, conn):
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                break
+
+            if message[0] == "ready":
+                handle.info = message[1]
+                handle.ready = True
+                logger.info({"msg": "Inference worker ready", "worker": handle.index, **message[1]})
+                continue
+
+            request_id, ok, payload = message
+            with self._lock:
+                future = handle.pending.pop(request_id, None)
+            if future is None:
+                continue
+            if ok:
+                future.set_result(payload)
+            else:
+                error_type, error = payload
+                future.set_exception(InferenceWorkerError(f"{error_type}: {error}"))
+
+        # Worker exited: fail what it still had in flight, then replace it
+        with self._lock:
+            pending, handle.pending = handle.pending, {}
+            handle.ready = False
+        for future in pending.values():
+            future.set_exception(InferenceWorkerError(f"inference worker {handle.index} exited"))
+
+        if not self._closed:
+            handle.restarts += 1
+            handle.process.join(timeout=1)
+            logger.error({"msg": "Inference worker exited, restarting", "worker": handle.index,
+                          "exitCode": handle.process.exitcode})
+            time.sleep(1)  # don't spin if the worker dies during startup
+            self._spawn(handle)
+
+    # -------------------------------------------------------------------------
+    # Introspection
+    # -------------------------------------------------------------------------
+    def status(self):
+        """
+        Per-worker state. A worker is "started" once it finished preloading,
+        and "ready" only if every preload also succeeded; the pool is ready
+        when all workers are (same contract as ModelWarmup.status()).
+        """
+        with self._lock:
+            workers = {
+                str(h.index): {
+                    "ready": h.ready and not (h.info or {}).get("errors"),
+                    "started": h.ready,
+                    "pid": h.process.pid if h.process else None,
+                    "inFlight": len(h.pending),
+                    "requests": h.requests,
+                    "restarts": h.restarts,
+                    **({"startup": h.info} if h.info else {}),
+                }
+                for h in self._handles
+            }
+        return {
+            "ready": all(w["ready"] for w in workers.values()),
+            "finished": all(w["started"] for w in workers.values()),
+            "workers": workers,
+        }
@@ -0,0 +1,147 @@
+# logging_setup.py - Sync or queued JSON logging with per-request sampling
+
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+from contextvars import ContextVar
+
+# Whether success-path logs of the current request are kept (decided once
+# per request by the API middleware; True outside requests).
+_request_sampled = ContextVar("request_sampled", default=True)
+
+
+def sample_request(rate: float) -> bool:
+    """Decide (and remember) whether the current request's logs are kept."""
+    sampled = rate >= 1.0 or random.random() < rate
+    _request_sampled.set(sampled)
+    return sampled
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Drops INFO/DEBUG records of unsampled requests. Warnings and errors are
+    always kept, and so is any record whose dict message has a durationMs
+    of at least `slow_ms`.
+    """
+
+    def __init__(self, slow_ms: float):
+        super().__init__()
+        self.slow_ms = slow_ms
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or _request_sampled.get():
+            return True
+        msg = record.msg
+        return isinstance(msg, dict) and msg.get("durationMs", 0) >= self.slow_ms
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; dict messages are merged into it."""
+
+    def format(self, record):
+        entry = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+        }
+        if isinstance(record.msg, dict):
+            entry.update(record.msg)
+        else:
+            entry["msg"] = record.getMessage()
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that never blocks the request path: records are queued as
+    they are (formatting happens on the listener thread) and counted as
+    dropped when the queue is full.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LoggingSetup:
+    """
+    Configures the root logger.
+
+    - mode "sync": the original `logging.basicConfig` text lines, written
+      on the calling thread.
+    - mode "async": JSON lines; handlers only enqueue records and a
+      QueueListener thread formats and writes them to stderr.
+
+    In both modes `sample_rate` < 1 keeps only that fraction of requests'
+    success-path logs (see SamplingFilter).
+    """
+
+    def __init__(self, mode: str = "sync", sample_rate: float = 1.0, slow_ms: float = 500.0,
+                 queue_size: int = 10000):
+        self.mode = mode
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.queue_size = queue_size
+        self.queue_handler = None
+        self.stream_handler = None
+        self.listener = None
+
+        root = logging.getLogger()
+        if mode == "async":
+            self.stream_handler = logging.StreamHandler(sys.stderr)
+            self.stream_handler.setFormatter(JsonFormatter())
+
+            self.queue_handler = DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+            self.queue_handler.addFilter(SamplingFilter(slow_ms))
+            root.handlers[:] = [self.queue_handler]
+            root.setLevel(logging.INFO)
+
+            self._start_listener()
+            # The writer thread does not survive fork() (serve.py workers)
+            os.register_at_fork(after_in_child=self._restart_in_child)
+        else:
+            logging.basicConfig(
+                format='%(asctime)s | %(levelname)s | %(message)s',
+                level=logging.INFO
+            )
+            for handler in root.handlers:
+                handler.addFilter(SamplingFilter(slow_ms))
+
+    def _start_listener(self):
+        self.listener = logging.handlers.QueueListener(self.queue_handler.queue, self.stream_handler)
+        self.listener.start()
+
+    def _restart_in_child(self):
+        # Fresh queue: the parent's writer thread may have held its lock
+        self.queue_handler.queue = queue.Queue(maxsize=self.queue_size)
+        self._start_listener()
+
+    def stop(self):
+        """Flush queued records and stop the listener thread."""
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+    def stats(self):
+        return {
+            "mode": self.mode,
+            "sample_rate": self.sample_rate,
+            "slow_ms": self.slow_ms,
+            "queued": self.queue_handler.queue.qsize() if self.queue_handler else 0,
+            "dropped": self.queue_handler.dropped if self.queue_handler else 0,
+        }
@@ -1,22 +1,44 @@
 # main.py – FastAPI Model Inference API
 # Now with request ID middleware, structured logging, and /models endpoints.
 
+from contextlib import asynccontextmanager
+import asyncio
 from typing import Optional, List, Dict, Any
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
 from pydantic import BaseModel
+import os
 import time
 import uuid
 import logging
 
+from inference_pool import InferencePool
+from logging_setup import LoggingSetup, sample_request
+from memory_stats import process_memory
+from metrics import Metrics
+from micro_batcher import MicroBatcher
+from prediction_cache import PredictionCache
 from registry import ModelRegistry
+from registry_watcher import RegistryWatcher
+from text_cache import TextCache
+from text_utils import clean_text, get_text_cache, set_text_cache
+from timing import record_stage, stage, staged_predict, start_request_timing
+from warmup import ModelWarmup
 
 
 # ------------------------------------------------------------------------------
 # Logging Setup (simple structured logging)
 # ------------------------------------------------------------------------------
-logging.basicConfig(
-    format='%(asctime)s | %(levelname)s | %(message)s',
-    level=logging.INFO
+# LOG_MODE=sync: text lines written on the request thread (default).
+# LOG_MODE=async: JSON lines queued to a background writer; records are
+# dropped (and counted) instead of blocking when LOG_QUEUE_SIZE is reached.
+# LOG_SAMPLE_RATE < 1 keeps success-path logs for only that fraction of
+# requests; errors and requests slower than LOG_SLOW_MS are always logged.
+logging_setup = LoggingSetup(
+    mode=os.getenv("LOG_MODE", "sync"),
+    sample_rate=float(os.getenv("LOG_SAMPLE_RATE", "1")),
+    slow_ms=float(os.getenv("LOG_SLOW_MS", "500")),
+    queue_size=int(os.getenv("LOG_QUEUE_SIZE", "10000")),
 )
 
 logger = logging.getLogger("python-api")
@@ -30,6 +52,11 @@ class PredictRequest(BaseModel):
     version: Optional[str] = None
 
 
+class BatchPredictRequest(BaseModel):
+    texts: List[str]
+    version: Optional[str] = None
+
+
 class ModelInfo(BaseModel):
     version: str
     metadata: Dict[str, Any]
@@ -43,8 +70,163 @@ class LatestModelInfo(BaseModel):
 # ------------------------------------------------------------------------------
 # FastAPI App + Registry
 # ------------------------------------------------------------------------------
-app = FastAPI(title="Text Classifier API", version="0.1.0")
-registry = ModelRegistry()
+# Versions preloaded at startup and never evicted from the model cache
+# (comma-separated), in addition to the latest version.
+PINNED_VERSIONS = [v.strip() for v in os.getenv("PINNED_VERSIONS", "").split(",") if v.strip()]
+
+# Versions served from the memory-mapped compiled scorer instead of
+# model.joblib (comma-separated list, "*" = every version that has a
+# compiled/ artifact, the default). Set it empty to always use joblib.
+COMPILED_SCORER_VERSIONS = os.getenv("COMPILED_SCORER_VERSIONS", "*")
+# The model cache holds at most MODEL_CACHE_SIZE versions and, when
+# MODEL_CACHE_BYTES > 0, at most that much estimated model memory.
+MODEL_CACHE_SIZE = int(os.getenv("MODEL_CACHE_SIZE", "8"))
+MODEL_CACHE_BYTES = int(os.getenv("MODEL_CACHE_BYTES", "0"))
+registry = ModelRegistry(
+    cache_size=MODEL_CACHE_SIZE,
+    compiled_versions=COMPILED_SCORER_VERSIONS,
+    cache_bytes=MODEL_CACHE_BYTES or None,
+    pinned_versions=PINNED_VERSIONS,
+    io_workers=int(os.getenv("REGISTRY_IO_WORKERS", "4")),
+)
+
+# Batch limits: max texts per /predict/batch request, and how many texts go
+# through the pipeline per call (bounds the TF-IDF sparse matrix size).
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "10000"))
+BATCH_CHUNK_SIZE = int(os.getenv("BATCH_CHUNK_SIZE", "512"))
+
+# Optional shared cache of cleaned text + tokens across model versions,
+# bounded by TEXT_CACHE_BYTES (0 = disabled).
+TEXT_CACHE_BYTES = int(os.getenv("TEXT_CACHE_BYTES", "0"))
+if TEXT_CACHE_BYTES > 0:
+    set_text_cache(TextCache(max_bytes=TEXT_CACHE_BYTES))
+
+# Opt-in prediction result cache keyed by (version, clean_text(text)),
+# bounded by PREDICTION_CACHE_BYTES (0 = disabled) and expiring after
+# PREDICTION_CACHE_TTL_SECONDS. Each entry records the artifact signature of
+# the model that computed it and is ignored once the version is re-published;
+# entries of a version are also dropped as soon as the registry sees that
+# version's artifact change on disk.
+PREDICTION_CACHE_BYTES = int(os.getenv("PREDICTION_CACHE_BYTES", "0"))
+prediction_cache = PredictionCache(
+    max_bytes=PREDICTION_CACHE_BYTES,
+    ttl_seconds=float(os.getenv("PREDICTION_CACHE_TTL_SECONDS", "300")),
+) if PREDICTION_CACHE_BYTES > 0 else None
+
+if prediction_cache is not None:
+    registry.add_change_listener(prediction_cache.invalidate_version)
+
+# Opt-in micro-batching: concurrent single /predict calls for the same
+# version are collected for up to MICRO_BATCH_MAX_WAIT_MS or
+# MICRO_BATCH_MAX_SIZE items and scored with one model.predict call.
+MICRO_BATCHING = os.getenv("MICRO_BATCHING", "0") == "1"
+batcher = MicroBatcher(
+    max_batch_size=int(os.getenv("MICRO_BATCH_MAX_SIZE", "32")),
+    max_wait_ms=float(os.getenv("MICRO_BATCH_MAX_WAIT_MS", "5")),
+) if MICRO_BATCHING else None
+
+# Startup warm-up: preload latest + PINNED_VERSIONS in the background and
+# run WARMUP_PREDICTIONS synthetic predictions on each.
+warmup = ModelWarmup(
+    registry,
+    pinned_versions=PINNED_VERSIONS,
+    predictions=int(os.getenv("WARMUP_PREDICTIONS", "3")),
+)
+
+
+# Optional process-pool inference backend: INFERENCE_WORKERS > 0 runs every
+# prediction in that many worker processes (each with its own loaded
+# models, cached with the same MODEL_CACHE_* limits and PINNED_VERSIONS),
+# so one API process can use several cores for scoring.
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "0"))
+inference_pool = InferencePool(
+    root=str(registry.root),
+    workers=INFERENCE_WORKERS,
+    compiled_versions=COMPILED_SCORER_VERSIONS,
+    preload_versions=PINNED_VERSIONS,
+    warm_predictions=int(os.getenv("WARMUP_PREDICTIONS", "3")),
+    cache_size=MODEL_CACHE_SIZE,
+    cache_bytes=MODEL_CACHE_BYTES or None,
+) if INFERENCE_WORKERS > 0 else None
+
+
+# Optional hot-reload: a background watcher (inotify, or polling every
+# REGISTRY_POLL_SECONDS) loads + warms new versions (in the inference
+# workers when the pool is enabled), then swaps the latest pointer used by
+# /predict.
+REGISTRY_WATCH = os.getenv("REGISTRY_WATCH", "0") == "1"
+watcher = RegistryWatcher(
+    registry,
+    poll_interval=float(os.getenv("REGISTRY_POLL_SECONDS", "2")),
+    warm_predictions=int(os.getenv("WARMUP_PREDICTIONS", "3")),
+    pool=inference_pool,
+) if REGISTRY_WATCH else None
+
+
+# Prometheus-style metrics served at GET /metrics. Request metrics are
+# labelled by route template (never the raw path) and by the model version
+# a handler resolved, so label cardinality stays bounded. With METRICS_DIR
+# (set by serve.py), every server process writes its samples there and
+# /metrics reports the sum over all of them.
+metrics = Metrics(shared_dir=os.getenv("METRICS_DIR") or None)
+metrics.counter("http_requests_total", "HTTP requests by route, method, status and model version")
+metrics.counter("http_request_errors_total", "HTTP requests answered with 5xx or an unhandled exception")
+metrics.histogram("http_request_duration_seconds", "Request latency by route, method and model version")
+metrics.gauge("http_requests_in_flight", "Requests currently being handled")
+metrics.histogram("model_load_duration_seconds", "Model load time from disk by version and artifact kind")
+
+registry.add_load_listener(
+    lambda version, kind, seconds: metrics.observe(
+        "model_load_duration_seconds", (("version", version), ("kind", kind)), seconds
+    )
+)
+
+# Every response carries a Server-Timing header with per-stage durations
+# (model, model-load, cache, clean, transform, score, batch, serialize,
+# total). SPAN_LOG=1 also logs them as one structured line per request.
+SPAN_LOG = os.getenv("SPAN_LOG", "0") == "1"
+registry.add_load_listener(lambda version, kind, seconds: record_stage("model-load", seconds))
+
+
+def collect_model_cache_metrics():
+    stats = registry.cache_stats()
+    return [
+        ("model_cache_hits_total", "counter", "Model cache hits", [((), stats["hits"])]),
+        ("model_cache_misses_total", "counter", "Model cache misses (loads)", [((), stats["misses"])]),
+        ("model_cache_evictions_total", "counter", "Models evicted from the cache", [((), stats["evictions"])]),
+        ("model_cache_entries", "gauge", "Models currently loaded", [((), stats["entries"])]),
+        ("model_cache_bytes", "gauge", "Estimated memory of loaded models", [((), stats["bytes"])]),
+    ]
+
+
+metrics.add_collector(collect_model_cache_metrics)
+metrics.add_collector(lambda: [
+    ("log_records_dropped_total", "counter", "Log records dropped because the log queue was full",
+     [((), logging_setup.stats()["dropped"])]),
+])
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    metrics.start()
+    # With the process pool, models are loaded + warmed in the workers
+    if inference_pool is not None:
+        inference_pool.start()
+    else:
+        warmup.start()
+    if watcher is not None:
+        watcher.start()
+    yield
+    if watcher is not None:
+        watcher.stop()
+    if inference_pool is not None:
+        inference_pool.close()
+    registry.close()
+    metrics.stop()
+    logging_setup.stop()
+
+
+app = FastAPI(title="Text Classifier API", version="0.1.0", lifespan=lifespan)
 
 
 # ------------------------------------------------------------------------------
@@ -54,6 +236,82 @@ def generate_request_id():
     return f"py-{uuid.uuid4().hex[:12]}"
 
 
+# ------------------------------------------------------------------------------
+# Helper: resolve requested (or latest) model version
+# ------------------------------------------------------------------------------
+def resolve_version(version: Optional[str]):
+    """
+    The explicit version, else the latest one (as published by the watcher
+    when enabled); None when only the registry/latest alias exists.
+    """
+    if version:
+        return version
+    if watcher is not None and watcher.latest_version:
+        return watcher.latest_version
+    if not registry.list_versions():
+        return None
+    return registry.get_latest_version()
+
+
+def resolve_model(version: Optional[str]):
+    """
+    Return (model, metadata, version) for an explicit version, or for the
+    latest version when `version` is empty. With the inference pool, `model`
+    is a PooledModel and the model itself is only loaded in the workers;
+    the artifact is still checked here so change listeners (prediction
+    cache) see re-published versions.
+    """
+    version = resolve_version(version)
+    if version is None:
+        if inference_pool is not None:
+            metadata = registry.get_latest_metadata()
+            return inference_pool.model(None), metadata, metadata.get("version", "unknown")
+        model, metadata = registry.get_latest_model()
+        return model, metadata, metadata.get("version", "unknown")
+
+    if inference_pool is not None:
+        registry.check_artifact(version)
+        return inference_pool.model(version), registry.get_metadata(version), version
+
+    model, metadata = registry.get_model(version)
+    return model, metadata, version
+
+
+def prediction_signature(version: Optional[str]):
+    """
+    Artifact signature the prediction cache stores results under, or None
+    (don't cache) for the registry/latest alias.
+    """
+    if version is None:
+        return None
+    try:
+        return registry.artifact_signature(version)
+    except OSError:
+        return None
+
+
+def model_summary(metadata: Dict[str, Any]):
+    return {
+        "best_cv_accuracy": metadata.get("best_cv_accuracy"),
+        "test_accuracy": metadata.get("test_accuracy"),
+        "saved_at": metadata.get("saved_at")
+    }
+
+
+# ------------------------------------------------------------------------------
+# Helper: request metrics
+# ------------------------------------------------------------------------------
+def record_request_metrics(request: Request, status_code: int, seconds: float):
+    route = getattr(request.scope.get("route"), "path", "unmatched")
+    version = getattr(request.state, "model_version", "")
+    labels = (("route", route), ("method", request.method), ("version", version))
+
+    metrics.inc("http_requests_total", labels + (("status", str(status_code)),))
+    metrics.observe("http_request_duration_seconds", labels, seconds)
+    if status_code >= 500:
+        metrics.inc("http_request_errors_total", labels)
+
+
 # ------------------------------------------------------------------------------
 # Middleware: attach requestId to every request + log start/end
 # ------------------------------------------------------------------------------
@@ -64,6 +322,8 @@ async def request_id_middleware(request: Request, call_next):
     request_id = incoming if incoming else generate_request_id()
 
     start = time.time()
+    timing = start_request_timing()
+    sample_request(logging_setup.sample_rate)
 
     # Log request start
     logger.info({
@@ -74,13 +334,39 @@ async def request_id_middleware(request: Request, call_next):
     })
 
     # Process request
-    response = await call_next(request)
+    metrics.inc("http_requests_in_flight")
+    try:
+        response = await call_next(request)
+    except Exception:
+        record_request_metrics(request, 500, time.time() - start)
+        logger.exception({
+            "msg": "Request failed",
+            "path": request.url.path,
+            "method": request.method,
+            "durationMs": round((time.time() - start) * 1000, 2),
+            "requestId": request_id
+        })
+        raise
+    finally:
+        metrics.dec("http_requests_in_flight")
+
+    record_request_metrics(request, response.status_code, time.time() - start)
 
     # Add header to response
     response.headers["x-request-id"] = request_id
 
     duration_ms = round((time.time() - start) * 1000, 2)
 
+    timing.add("total", duration_ms / 1000)
+    response.headers["server-timing"] = timing.header()
+    if SPAN_LOG:
+        logger.info({
+            "msg": "Request spans",
+            "path": request.url.path,
+            "requestId": request_id,
+            "spans": timing.as_dict()
+        })
+
     # Log request completion
     logger.info({
         "msg": "Completed request",
@@ -112,6 +398,21 @@ def health(request: Request):
     }
 
 
+# ------------------------------------------------------------------------------
+# Readiness Endpoint
+# ------------------------------------------------------------------------------
+@app.get("/ready")
+def ready():
+    """
+    503 until startup warm-up has loaded and warmed every preloaded model
+    (in every inference worker when the process pool is enabled), 200
+    afterwards; stays 503 if any of them failed to load. Reports per-model /
+    per-worker startup details and errors either way.
+    """
+    status = (inference_pool or warmup).status()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
+
 # ------------------------------------------------------------------------------
 # Predict Endpoint
 # ------------------------------------------------------------------------------
@@ -125,16 +426,36 @@ def predict(request_payload: PredictRequest, request: Request):
         "version": request_payload.version
     })
 
-    # Load correct model version
-    if request_payload.version:
-        model, metadata = registry.get_model(request_payload.version)
-        version = request_payload.version
-    else:
-        model, metadata = registry.get_latest_model()
-        version = metadata.get("version", "unknown")
-
-    # Perform prediction
-    prediction = model.predict([request_payload.text])[0]
+    # Load correct model version. The prediction cache signature is taken
+    # first: a result computed on an artifact re-published in between is
+    # then stored under the older signature, which later lookups reject.
+    with stage("model"):
+        version = resolve_version(request_payload.version)
+        signature = prediction_signature(version) if prediction_cache is not None else None
+        model, metadata, version = resolve_model(version)
+    request.state.model_version = version
+
+    # Serve repeated texts from the prediction cache when enabled.
+    # Models use clean_text as preprocessor, so the cleaned text is the key.
+    prediction = None
+    cache_text = None
+    if signature is not None:
+        with stage("cache"):
+            cache_text = clean_text(request_payload.text)
+            prediction = prediction_cache.get(version, cache_text, signature)
+
+    # Perform prediction (through the micro-batcher when enabled)
+    cache_status = "HIT" if prediction is not None else "MISS"
+    if prediction is None:
+        if batcher is not None:
+            with stage("batch"):
+                prediction = batcher.predict(version, model, request_payload.text)
+        else:
+            cleaned = [cache_text] if cache_text is not None else None
+            prediction = staged_predict(model, [request_payload.text], cleaned)[0]
+
+        if signature is not None:
+            prediction_cache.put(version, cache_text, prediction, signature)
 
     logger.info({
         "msg": "Prediction complete",
@@ -143,29 +464,187 @@ def predict(request_payload: PredictRequest, request: Request):
         "modelVersion": version
     })
 
-    return {
-        "version": version,
-        "prediction": prediction,
-        "metadata": {
-            "best_cv_accuracy": metadata.get("best_cv_accuracy"),
-            "test_accuracy": metadata.get("test_accuracy"),
-            "saved_at": metadata.get("saved_at")
-        },
-        "requestId": request_id
-    }
+    with stage("serialize"):
+        response = JSONResponse({
+            "version": version,
+            "prediction": prediction,
+            "metadata": model_summary(metadata),
+            "requestId": request_id
+        })
+
+    if signature is not None:
+        response.headers["x-prediction-cache"] = cache_status
+    return response
+
+
+# ------------------------------------------------------------------------------
+# Batch Predict Endpoint
+# ------------------------------------------------------------------------------
+@app.post("/predict/batch")
+def predict_batch(request_payload: BatchPredictRequest, request: Request):
+    """
+    Predict labels for many texts with one model version.
+
+    Texts are scored in chunks of BATCH_CHUNK_SIZE (one vectorized pipeline
+    call per chunk) and predictions are returned in input order.
+    """
+    request_id = request.headers.get("x-request-id", "unknown")
+    texts = request_payload.texts
+
+    logger.info({
+        "msg": "Handling /predict/batch",
+        "requestId": request_id,
+        "version": request_payload.version,
+        "count": len(texts)
+    })
+
+    if len(texts) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {len(texts)} texts (max {MAX_BATCH_SIZE})"
+        )
+
+    with stage("model"):
+        model, metadata, version = resolve_model(request_payload.version)
+    request.state.model_version = version
+
+    predictions: List[str] = []
+    for start in range(0, len(texts), BATCH_CHUNK_SIZE):
+        chunk = texts[start:start + BATCH_CHUNK_SIZE]
+        predictions.extend(staged_predict(model, chunk).tolist())
+
+    logger.info({
+        "msg": "Batch prediction complete",
+        "requestId": request_id,
+        "count": len(predictions),
+        "modelVersion": version
+    })
+
+    with stage("serialize"):
+        return JSONResponse({
+            "version": version,
+            "predictions": predictions,
+            "count": len(predictions),
+            "metadata": model_summary(metadata),
+            "requestId": request_id
+        })
+
+
+# ------------------------------------------------------------------------------
+# Metrics Endpoint (Prometheus text format)
+# ------------------------------------------------------------------------------
+@app.get("/metrics")
+def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+# ------------------------------------------------------------------------------
+# Micro-batcher stats Endpoint
+# ------------------------------------------------------------------------------
+@app.get("/stats/batcher")
+def batcher_stats():
+    """
+    Queue depth and batch-size histogram of the micro-batcher, used to tune
+    MICRO_BATCH_MAX_WAIT_MS / MICRO_BATCH_MAX_SIZE (latency vs throughput).
+    """
+    if batcher is None:
+        return {"enabled": False}
+
+    return {"enabled": True, **batcher.stats()}
+
+
+# ------------------------------------------------------------------------------
+# Text cache stats Endpoint
+# ------------------------------------------------------------------------------
+@app.get("/stats/text-cache")
+def text_cache_stats():
+    """
+    Size and hit ratio of the shared clean_text / token cache, used to size
+    TEXT_CACHE_BYTES for the traffic mix.
+    """
+    cache = get_text_cache()
+    if cache is None:
+        return {"enabled": False}
+
+    return {"enabled": True, **cache.stats()}
+
+
+# ------------------------------------------------------------------------------
+# Prediction cache stats Endpoint
+# ------------------------------------------------------------------------------
+@app.get("/stats/prediction-cache")
+def prediction_cache_stats():
+    if prediction_cache is None:
+        return {"enabled": False}
+
+    return {"enabled": True, **prediction_cache.stats()}
+
+
+# ------------------------------------------------------------------------------
+# Model cache stats Endpoint
+# ------------------------------------------------------------------------------
+@app.get("/stats/model-cache")
+def model_cache_stats():
+    """
+    Loaded model versions with their estimated memory, usage against
+    MODEL_CACHE_BYTES, and eviction counters.
+    """
+    return {"enabled": True, **registry.cache_stats()}
+
+
+# ------------------------------------------------------------------------------
+# Inference pool stats Endpoint
+# ------------------------------------------------------------------------------
+@app.get("/stats/inference-pool")
+def inference_pool_stats():
+    if inference_pool is None:
+        return {"enabled": False}
+
+    return {"enabled": True, **inference_pool.status()}
+
+
+# ------------------------------------------------------------------------------
+# Logging stats Endpoint
+# ------------------------------------------------------------------------------
+@app.get("/stats/logging")
+def logging_stats():
+    return logging_setup.stats()
+
+
+# ------------------------------------------------------------------------------
+# Process memory stats Endpoint
+# ------------------------------------------------------------------------------
+@app.get("/stats/memory")
+def memory_stats():
+    """
+    RSS / PSS and shared vs private memory of the process that served this
+    request (one worker when running under serve.py).
+    """
+    return process_memory()
+
+
+# ------------------------------------------------------------------------------
+# Registry watcher stats Endpoint
+# ------------------------------------------------------------------------------
+@app.get("/stats/registry-watcher")
+def registry_watcher_stats():
+    if watcher is None:
+        return {"enabled": False}
+
+    return {"enabled": True, **watcher.stats()}
 
 
 # ------------------------------------------------------------------------------
 # NEW: List All Models Endpoint
 # ------------------------------------------------------------------------------
 @app.get("/models", response_model=List[ModelInfo])
-def list_models(request: Request):
+async def list_models(request: Request):
     """
     List all discovered model versions under the registry, with their metadata.
 
-    Uses:
-      - registry.list_versions()
-      - registry.get_metadata(version)
+    Uses (on the registry's own I/O executor, off the request threadpool):
+      - registry.alist_versions()
+      - registry.aget_metadata(version)
     """
     request_id = request.headers.get("x-request-id", "unknown")
 
@@ -174,18 +653,19 @@ def list_models(request: Request):
         "requestId": request_id
     })
 
-    versions = registry.list_versions()
+    versions = await registry.alist_versions()
+    results = await asyncio.gather(
+        *(registry.aget_metadata(v) for v in versions), return_exceptions=True
+    )
     models: List[ModelInfo] = []
 
-    for v in versions:
-        try:
-            metadata = registry.get_metadata(v)
-        except Exception as ex:
+    for v, metadata in zip(versions, results):
+        if isinstance(metadata, Exception):
             logger.error({
                 "msg": "Failed to read metadata for version",
                 "version": v,
                 "requestId": request_id,
-                "error": str(ex)
+                "error": str(metadata)
             })
             # Skip broken entries
             continue
@@ -205,12 +685,12 @@ def list_models(request: Request):
 # NEW: Latest Model Info Endpoint
 # ------------------------------------------------------------------------------
 @app.get("/models/latest", response_model=LatestModelInfo)
-def get_latest_model_info(request: Request):
+async def get_latest_model_info(request: Request):
     """
     Return the latest version + metadata.
     Uses:
-      - registry.get_latest_version()
-      - registry.get_metadata(version)
+      - registry.aget_latest_version()
+      - registry.aget_metadata(version)
     """
     request_id = request.headers.get("x-request-id", "unknown")
 
@@ -219,8 +699,8 @@ def get_latest_model_info(request: Request):
         "requestId": request_id
     })
 
-    version = registry.get_latest_version()
-    metadata = registry.get_metadata(version)
+    version = await registry.aget_latest_version()
+    metadata = await registry.aget_metadata(version)
 
     logger.info({
         "msg": "Completed /models/latest",
@@ -0,0 +1,38 @@
+# memory_stats.py - Per-process RSS vs shared memory (Linux /proc)
+
+import os
+
+# /proc/<pid>/smaps_rollup fields reported, in kB
+_SMAPS_FIELDS = {
+    "Rss": "rssKb",
+    "Pss": "pssKb",
+    "Shared_Clean": "sharedCleanKb",
+    "Shared_Dirty": "sharedDirtyKb",
+    "Private_Clean": "privateCleanKb",
+    "Private_Dirty": "privateDirtyKb",
+}
+
+
+def process_memory(pid="self"):
+    """
+    Memory of one process in kB: RSS, PSS, and how much of the RSS is
+    shared with other processes (e.g. copy-on-write pages inherited from a
+    pre-fork master) versus private to it.
+
+    Returns {"pid": ...} plus whatever the platform exposes; empty numbers
+    on systems without /proc.
+    """
+    stats = {"pid": os.getpid() if pid == "self" else pid}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                key = _SMAPS_FIELDS.get(name)
+                if key:
+                    stats[key] = int(value.split()[0])
+    except OSError:
+        return stats
+
+    stats["sharedKb"] = stats.get("sharedCleanKb", 0) + stats.get("sharedDirtyKb", 0)
+    stats["privateKb"] = stats.get("privateCleanKb", 0) + stats.get("privateDirtyKb", 0)
+    return stats
@@ -0,0 +1,264 @@
+# metrics.py - Lock-cheap counters / gauges / histograms with Prometheus text export
+
+import bisect
+import json
+import os
+import threading
+from pathlib import Path
+
+# Latency buckets in seconds (upper bounds; "+Inf" is implicit)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Metrics:
+    """
+    Minimal metrics registry exported in the Prometheus text format.
+
+    Recording is lock-free on the hot path: every thread writes to its own
+    shard (a dict), and only a scrape sums the shards. The one lock is
+    taken when a thread records its first sample. Counters and gauges are
+    sums over shards, so a gauge may be incremented on one thread and
+    decremented on another.
+
+    Metrics are declared up front (name, type, help text); values are keyed
+    by a tuple of (label, value) pairs. Collectors registered with
+    add_collector() are called at scrape time to export values that already
+    live elsewhere (e.g. ModelCache counters).
+
+    With `shared_dir` (several server processes, e.g. serve.py workers),
+    each process writes its samples to <shared_dir>/<pid>.json every
+    `flush_seconds` and on every scrape, and render() sums all processes:
+    counters and histograms of exited processes are kept, their gauges
+    dropped. Collector samples are per process and get a `pid` label.
+    """
+
+    def __init__(self, shared_dir=None, flush_seconds: float = 1.0):
+        self._definitions = {}
+        self._local = threading.local()
+        self._shards = []
+        self._shards_lock = threading.Lock()
+        self._collectors = []
+
+        self.shared_dir = Path(shared_dir) if shared_dir else None
+        self.flush_seconds = flush_seconds
+        self._pid = os.getpid()
+        self._stop = threading.Event()
+        self._flusher = None
+
+    # -------------------------------------------------------------------------
+    # Declaration
+    # -------------------------------------------------------------------------
+    def counter(self, name: str, help_text: str):
+        self._definitions[name] = ("counter", help_text, None)
+
+    def gauge(self, name: str, help_text: str):
+        self._definitions[name] = ("gauge", help_text, None)
+
+    def histogram(self, name: str, help_text: str, buckets=LATENCY_BUCKETS):
+        self._definitions[name] = ("histogram", help_text, tuple(buckets))
+
+    def add_collector(self, collect):
+        """
+        `collect()` returns [(name, type, help, [(labels, value), ...]), ...]
+        and is called on every scrape.
+        """
+        self._collectors.append(collect)
+
+    # -------------------------------------------------------------------------
+    # Recording (hot path)
+    # -------------------------------------------------------------------------
+    def _shard(self):
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._shards_lock:
+                self._shards.append(shard)
+        return shard
+
+    def inc(self, name: str, labels=(), value: float = 1):
+        shard = self._shard()
+        key = (name, labels)
+        shard[key] = shard.get(key, 0) + value
+
+    def dec(self, name: str, labels=(), value: float = 1):
+        self.inc(name, labels, -value)
+
+    def observe(self, name: str, labels, value: float):
+        buckets = self._definitions[name][2]
+        shard = self._shard()
+        key = (name, labels)
+        series = shard.get(key)
+        if series is None:
+            # Per-bucket counts (+Inf last), then sum
+            series = shard[key] = [0] * (len(buckets) + 1) + [0.0]
+        series[bisect.bisect_left(buckets, value)] += 1
+        series[-1] += value
+
+    # -------------------------------------------------------------------------
+    # Shared directory (multi-process servers)
+    # -------------------------------------------------------------------------
+    def start(self):
+        """
+        Start flushing this process's samples to `shared_dir` (no-op
+        without one). Call it in every server process; samples a forked
+        process inherited from its parent are dropped first, since the
+        parent reports them itself (see flush()).
+        """
+        if self.shared_dir is None:
+            return
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._local = threading.local()
+            self._shards = []
+            self._shards_lock = threading.Lock()
+
+        self._stop.clear()
+        self._flusher = threading.Thread(target=self._flush_loop, name="metrics-flush", daemon=True)
+        self._flusher.start()
+
+    def stop(self):
+        if self._flusher is not None:
+            self._stop.set()
+            self._flusher.join(timeout=self.flush_seconds + 1)
+            self._flusher = None
+        self.flush()
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.flush_seconds):
+            try:
+                self.flush()
+            except OSError:
+                pass
+
+    def flush(self):
+        """Write this process's samples to <shared_dir>/<pid>.json."""
+        if self.shared_dir is None:
+            return
+        payload = {
+            "samples": [[name, labels, value] for (name, labels), value in self._merged().items()],
+            "collected": [[name, kind, help_text, samples]
+                          for collect in self._collectors
+                          for name, kind, help_text, samples in collect()],
+        }
+        path = self.shared_dir / f"{os.getpid()}.json"
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        tmp_path.write_text(json.dumps(payload))
+        os.replace(tmp_path, path)
+
+    def _read_shared(self):
+        """
+        (merged samples, collector output) of every process in shared_dir,
+        this one included.
+        """
+        self.flush()
+        merged = {}
+        collected = []
+        for path in sorted(self.shared_dir.glob("*.json")):
+            try:
+                pid = int(path.stem)
+                payload = json.loads(path.read_text())
+            except (ValueError, OSError):
+                continue
+            alive = _pid_alive(pid)
+
+            for name, labels, value in payload["samples"]:
+                kind = self._definitions.get(name, ("gauge",))[0]
+                if kind == "gauge" and not alive:
+                    continue
+                key = (name, tuple(tuple(pair) for pair in labels))
+                total = merged.get(key)
+                if isinstance(value, list):
+                    merged[key] = value if total is None else [a + b for a, b in zip(total, value)]
+                else:
+                    merged[key] = (total or 0) + value
+
+            if alive:
+                for name, kind, help_text, samples in payload["collected"]:
+                    collected.append((name, kind, help_text, [
+                        (tuple(tuple(pair) for pair in labels) + (("pid", str(pid)),), value)
+                        for labels, value in samples
+                    ]))
+        return merged, collected
+
+    # -------------------------------------------------------------------------
+    # Export
+    # -------------------------------------------------------------------------
+    def _merged(self):
+        with self._shards_lock:
+            shards = list(self._shards)
+
+        merged = {}
+        for shard in shards:
+            for key, value in list(shard.items()):
+                if isinstance(value, list):
+                    total = merged.get(key)
+                    merged[key] = value[:] if total is None else [a + b for a, b in zip(total, value)]
+                else:
+                    merged[key] = merged.get(key, 0) + value
+        return merged
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (0.0.4)."""
+        if self.shared_dir is not None:
+            merged, collected = self._read_shared()
+        else:
+            merged = self._merged()
+            collected = [sample for collect in self._collectors for sample in collect()]
+
+        by_name = {}
+        for (name, labels), value in merged.items():
+            by_name.setdefault(name, []).append((labels, value))
+
+        lines = []
+        for name, (kind, help_text, buckets) in self._definitions.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in sorted(by_name.get(name, []), key=lambda s: s[0]):
+                if kind != "histogram":
+                    lines.append(f"{name}{_labels(labels)} {_number(value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(buckets + (float("inf"),), value[:-1]):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else _number(bound)
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', le),))} {cumulative}")
+                lines.append(f"{name}_sum{_labels(labels)} {_number(value[-1])}")
+                lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+
+        collected_by_name = {}
+        for name, kind, help_text, samples in collected:
+            entry = collected_by_name.setdefault(name, (kind, help_text, []))
+            entry[2].extend(samples)
+        for name, (kind, help_text, samples) in collected_by_name.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{_labels(labels)} {_number(value)}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _number(value) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
@@ -0,0 +1,186 @@
+# micro_batcher.py - Dynamic micro-batching for single-text predictions
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+# Upper bounds of the batch-size histogram buckets (last bucket is "+Inf")
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+
+class _PendingItem:
+    def __init__(self, model, text: str, method: str):
+        self.model = model
+        self.text = text
+        self.method = method
+        self.future = Future()
+
+
+class _VersionQueue:
+    """Pending items + worker thread for one model version."""
+
+    def __init__(self):
+        self.items = queue.Queue()
+        self.thread = None
+
+
+class MicroBatcher:
+    """
+    Collects concurrent single-text predictions per model version and
+    scores them with one vectorized call.
+
+    - Each version gets its own queue and worker thread.
+    - The worker takes the first waiting item, then keeps collecting until
+      `max_batch_size` items are queued or `max_wait_ms` has passed.
+    - Items are grouped by (model instance, method) and scored with a single
+      `model.predict(texts)` / `model.predict_proba(texts)` call; each caller
+      gets its own row back through a Future.
+    - Models that score asynchronously (PooledModel: `model.submit(method,
+      texts)` returns a Future) are handed the batch without waiting, so
+      the worker goes back to collecting and several batches of one version
+      can be in flight across the inference pool's processes.
+
+    Callers block in `predict()` until their batch has run, so this works
+    from plain `def` FastAPI handlers (Starlette threadpool). Note the batch
+    size is effectively capped by the threadpool size (40 by default).
+    """
+
+    def __init__(self, max_batch_size: int = 32, max_wait_ms: float = 5.0):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be >= 1")
+
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._queues = {}
+        self._lock = threading.Lock()
+
+        # Stats
+        self._stats_lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+        self.histogram = [0] * (len(BATCH_SIZE_BUCKETS) + 1)
+
+    # -------------------------------------------------------------------------
+    # Public API
+    # -------------------------------------------------------------------------
+    def predict(self, version: str, model, text: str, method: str = "predict"):
+        """
+        Queue one text for `version` and block until its result is ready.
+
+        Returns the single-row result of `model.<method>([text])`, e.g. a
+        label for "predict" or a list of class probabilities for
+        "predict_proba".
+        """
+        item = _PendingItem(model, text, method)
+        self._queue_for(version).items.put(item)
+        return item.future.result()
+
+    def stats(self):
+        """
+        Queue depth per version plus batch count / size histogram.
+        """
+        with self._lock:
+            queue_depth = {v: q.items.qsize() for v, q in self._queues.items()}
+
+        with self._stats_lock:
+            buckets = {}
+            for bound, count in zip(BATCH_SIZE_BUCKETS, self.histogram):
+                buckets[str(bound)] = count
+            buckets["+Inf"] = self.histogram[-1]
+
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000.0,
+                "queue_depth": queue_depth,
+                "batches": self.batches,
+                "items": self.items,
+                "avg_batch_size": (self.items / self.batches) if self.batches else 0.0,
+                "batch_size_histogram": buckets,
+            }
+
+    # -------------------------------------------------------------------------
+    # Worker
+    # -------------------------------------------------------------------------
+    def _queue_for(self, version: str):
+        with self._lock:
+            q = self._queues.get(version)
+            if q is None:
+                q = _VersionQueue()
+                q.thread = threading.Thread(
+                    target=self._run,
+                    args=(q,),
+                    name=f"micro-batcher-{version}",
+                    daemon=True,
+                )
+                self._queues[version] = q
+                q.thread.start()
+            return q
+
+    def _run(self, q: _VersionQueue):
+        while True:
+            batch = [q.items.get()]
+            deadline = time.monotonic() + self.max_wait
+
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(q.items.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            self._record(len(batch))
+            self._execute(batch)
+
+    def _execute(self, batch):
+        # Group by model instance + method so each group is one vectorized call
+        groups = {}
+        for item in batch:
+            groups.setdefault((id(item.model), item.method), []).append(item)
+
+        for items in groups.values():
+            model = items[0].model
+            method = items[0].method
+            texts = [item.text for item in items]
+            submit = getattr(model, "submit", None)
+            try:
+                if submit is not None:
+                    submit(method, texts).add_done_callback(
+                        lambda future, items=items: self._resolve(items, future.result)
+                    )
+                else:
+                    results = getattr(model, method)(texts)
+                    self._resolve(items, lambda: results)
+            except Exception as ex:
+                self._fail(items, ex)
+
+    def _resolve(self, items, get_results):
+        try:
+            results = get_results()
+            for item, result in zip(items, results):
+                if hasattr(result, "tolist"):
+                    result = result.tolist()
+                item.future.set_result(result)
+        except Exception as ex:
+            self._fail(items, ex)
+
+    @staticmethod
+    def _fail(items, ex):
+        for item in items:
+            if not item.future.done():
+                item.future.set_exception(ex)
+
+    def _record(self, batch_size: int):
+        with self._stats_lock:
+            self.batches += 1
+            self.items += batch_size
+            for i, bound in enumerate(BATCH_SIZE_BUCKETS):
+                if batch_size <= bound:
+                    self.histogram[i] += 1
+                    break
+            else:
+                self.histogram[-1] += 1
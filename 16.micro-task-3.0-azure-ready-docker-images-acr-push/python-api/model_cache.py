@@ -0,0 +1,224 @@
+# model_cache.py - Bounded, thread-safe LRU cache for loaded models
+
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+def estimate_size(obj, _seen=None):
+    """
+    Approximate heap size in bytes of a loaded model: walks attributes,
+    dicts (e.g. a vectorizer vocabulary), sequences and NumPy arrays.
+
+    Memory-mapped arrays only count their header: their pages live in the
+    shared OS page cache, not in this process's heap.
+    """
+    seen = _seen if _seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    # Includes the data buffer only when the array owns it
+    size = sys.getsizeof(obj)
+
+    if isinstance(obj, np.ndarray):
+        if not obj.flags.owndata and isinstance(obj.base, np.ndarray):
+            size += estimate_size(obj.base, seen)
+        return size
+    if isinstance(obj, (str, bytes, int, float, bool, type(None))):
+        return size
+    if isinstance(obj, dict):
+        return size + sum(estimate_size(k, seen) + estimate_size(v, seen)
+                          for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return size + sum(estimate_size(item, seen) for item in obj)
+
+    attributes = getattr(obj, "__dict__", None)
+    if isinstance(attributes, dict):
+        size += estimate_size(attributes, seen)
+    for name in getattr(type(obj), "__slots__", ()):
+        if hasattr(obj, name):
+            size += estimate_size(getattr(obj, name), seen)
+    return size
+
+
+class _CacheEntry:
+    """A loaded value plus the file signature it was loaded from."""
+
+    def __init__(self, value, signature, size=0):
+        self.value = value
+        self.signature = signature
+        self.size = size
+
+
+class _PendingLoad:
+    """
+    Tracks a load that is currently in progress for one key.
+
+    Threads that miss on a key while another thread is already loading it
+    wait on `event` instead of starting a second load.
+    """
+
+    def __init__(self, signature):
+        self.signature = signature
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class ModelCache:
+    """
+    In-process LRU cache for loaded models.
+
+    - Keyed by model version (or any hashable key).
+    - Each entry remembers a "signature" (e.g. file mtime + size). A lookup
+      with a different signature is treated as a miss and reloads the entry,
+      so re-published artifacts are picked up automatically.
+    - Holds at most `max_entries` entries and, when `max_bytes` is set, at
+      most `max_bytes` of estimated model memory (see estimate_size); least
+      recently used entries are evicted first.
+    - Keys returned by `pinned()` (e.g. the latest version) are never
+      evicted, even if that leaves the cache over budget.
+    - Concurrent misses on the same key trigger exactly one load; the other
+      threads wait for it and share the result.
+    """
+
+    def __init__(self, max_entries: int = 8, max_bytes: int = None, pinned=None,
+                 sizer=estimate_size):
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError("max_bytes must be >= 1")
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.pinned = pinned or (lambda: ())
+        self.sizer = sizer
+        self._entries = OrderedDict()
+        self._loading = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
+
+    # -------------------------------------------------------------------------
+    # Lookup / load
+    # -------------------------------------------------------------------------
+    def get_or_load(self, key, signature, loader):
+        """
+        Return the cached value for `key` if its signature matches,
+        otherwise call `loader()` once and cache the result.
+        """
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry.signature == signature:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry.value
+
+                pending = self._loading.get(key)
+                owner = pending is None
+                if owner:
+                    pending = _PendingLoad(signature)
+                    self._loading[key] = pending
+                    self.misses += 1
+
+            if not owner:
+                # Another thread is loading this key: wait and share its result
+                pending.event.wait()
+                if pending.error is not None:
+                    raise pending.error
+                if pending.signature == signature:
+                    with self._lock:
+                        self.hits += 1
+                    return pending.value
+                # The other load was for a stale signature; try again
+                continue
+
+            try:
+                value = loader()
+                size = self.sizer(value)
+                pinned = set(self.pinned())
+            except BaseException as ex:
+                pending.error = ex
+                with self._lock:
+                    del self._loading[key]
+                pending.event.set()
+                raise
+
+            with self._lock:
+                previous = self._entries.pop(key, None)
+                if previous is not None:
+                    self.current_bytes -= previous.size
+                self._entries[key] = _CacheEntry(value, signature, size)
+                self.current_bytes += size
+                self._evict_locked(pinned)
+                del self._loading[key]
+
+            pending.value = value
+            pending.event.set()
+            return value
+
+    # -------------------------------------------------------------------------
+    # Eviction / invalidation
+    # -------------------------------------------------------------------------
+    def _over_budget_locked(self):
+        if len(self._entries) > self.max_entries:
+            return True
+        return self.max_bytes is not None and self.current_bytes > self.max_bytes
+
+    def _evict_locked(self, pinned=()):
+        for key in list(self._entries):
+            if not self._over_budget_locked():
+                break
+            if key in pinned:
+                continue
+            entry = self._entries.pop(key)
+            self.current_bytes -= entry.size
+            self.evictions += 1
+            self.evicted_bytes += entry.size
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def invalidate(self, key=None):
+        """
+        Drop one cached key, or everything when `key` is None.
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self.current_bytes = 0
+            else:
+                entry = self._entries.pop(key, None)
+                if entry is not None:
+                    self.current_bytes -= entry.size
+
+    # -------------------------------------------------------------------------
+    # Introspection
+    # -------------------------------------------------------------------------
+    def stats(self):
+        """
+        Return a snapshot of cache counters and the currently cached keys
+        (least recently used first) with their estimated sizes.
+        """
+        with self._lock:
+            return {
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "keys": list(self._entries.keys()),
+                "sizes": {key: entry.size for key, entry in self._entries.items()},
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "evicted_bytes": self.evicted_bytes,
+            }
@@ -0,0 +1,139 @@
+# prediction_cache.py - Per-version prediction result cache with TTL and byte cap
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+# Rough fixed cost per entry: key tuple, entry object, OrderedDict slot
+_ENTRY_OVERHEAD_BYTES = 200
+
+
+class _CachedPrediction:
+    __slots__ = ("value", "signature", "expires_at", "size")
+
+    def __init__(self, value, signature, expires_at: float, size: int):
+        self.value = value
+        self.signature = signature
+        self.expires_at = expires_at
+        self.size = size
+
+
+class PredictionCache:
+    """
+    LRU cache of prediction results keyed by (model version, normalized text).
+
+    - Entries expire `ttl_seconds` after they were stored.
+    - Total approximate size is capped at `max_bytes`; least recently used
+      entries are evicted first.
+    - Every entry records the artifact signature of the model that produced
+      it (ModelRegistry.artifact_signature); get() with a different
+      signature drops the entry. A request that scored on an artifact
+      re-published meanwhile can therefore never put a stale result back.
+    - invalidate_version() drops every entry of one version; the API wires
+      it to ModelRegistry.add_change_listener to free that memory early.
+    """
+
+    def __init__(self, max_bytes: int, ttl_seconds: float = 300.0):
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be >= 1")
+
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.current_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.stale = 0
+
+    # -------------------------------------------------------------------------
+    # Lookup / store
+    # -------------------------------------------------------------------------
+    def get(self, version: str, text: str, signature):
+        """
+        Return the cached prediction, or None on a miss, an expired entry or
+        an entry computed with another artifact `signature`.
+        """
+        key = (version, text)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            if entry.expires_at <= now or entry.signature != signature:
+                del self._entries[key]
+                self.current_bytes -= entry.size
+                if entry.expires_at <= now:
+                    self.expirations += 1
+                else:
+                    self.stale += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def put(self, version: str, text: str, value, signature):
+        """
+        Store `value`, computed by the model whose artifact signature was
+        `signature` (taken before that model was loaded).
+        """
+        key = (version, text)
+        size = (_ENTRY_OVERHEAD_BYTES + sys.getsizeof(version)
+                + sys.getsizeof(text) + sys.getsizeof(value))
+        if size > self.max_bytes:
+            return
+
+        entry = _CachedPrediction(value, signature, time.monotonic() + self.ttl_seconds, size)
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= previous.size
+
+            self._entries[key] = entry
+            self.current_bytes += size
+
+            while self.current_bytes > self.max_bytes:
+                _, old = self._entries.popitem(last=False)
+                self.current_bytes -= old.size
+                self.evictions += 1
+
+    # -------------------------------------------------------------------------
+    # Invalidation
+    # -------------------------------------------------------------------------
+    def invalidate_version(self, version: str):
+        with self._lock:
+            stale = [key for key in self._entries if key[0] == version]
+            for key in stale:
+                self.current_bytes -= self._entries.pop(key).size
+            self.invalidations += 1
+
+    # -------------------------------------------------------------------------
+    # Introspection
+    # -------------------------------------------------------------------------
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "bytes": self.current_bytes,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+                "expirations": self.expirations,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "stale": self.stale,
+            }
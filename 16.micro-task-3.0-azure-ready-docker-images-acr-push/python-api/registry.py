@@ -1,10 +1,104 @@
 # registry.py - Local Model Registry Abstraction with Auto-Discovery
 
+import asyncio
+import functools
+import hashlib
 import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import joblib
 from datetime import datetime
 
+from compiled_model import CompiledLinearModel, HEADER_FILE, check_matches, export_pipeline
+from model_cache import ModelCache
+
+# joblib compression codecs accepted by save_model(); lz4 needs the optional
+# `lz4` package.
+COMPRESSION_CODECS = ("none", "zlib", "gzip", "bz2", "lzma", "xz", "lz4")
+
+
+def joblib_compress_arg(codec: str = "none", level: int = 3):
+    """
+    Translate (codec, level) into joblib.dump's `compress` argument.
+
+    Raises ValueError for unknown codecs, invalid levels or when lz4 is
+    requested but not installed.
+    """
+    codec = (codec or "none").lower()
+    if codec not in COMPRESSION_CODECS:
+        raise ValueError(f"Unknown compression codec {codec!r}; "
+                         f"expected one of {', '.join(COMPRESSION_CODECS)}")
+    if codec == "none":
+        return 0
+    if not 1 <= level <= 9:
+        raise ValueError("compression level must be between 1 and 9")
+    if codec == "lz4":
+        try:
+            import lz4  # noqa: F401
+        except ImportError:
+            raise ValueError("lz4 compression requires the 'lz4' package") from None
+    return (codec, level)
+
+
+class _HashingSpool:
+    """
+    Write-only file object for joblib.dump that hashes everything written
+    and buffers it in memory, spilling to `path` once more than
+    `spool_bytes` have been written. persist() puts the full content in
+    `path` (fsynced); close() drops whatever was buffered or opened.
+    """
+
+    def __init__(self, path: Path, spool_bytes: int):
+        self.path = path
+        self.spool_bytes = spool_bytes
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self.chunks = []
+        self.file = None
+
+    def write(self, data):
+        data = bytes(data)
+        self.digest.update(data)
+        self.size += len(data)
+        if self.file is None and self.size > self.spool_bytes:
+            self.file = open(self.path, "wb")
+            self.file.writelines(self.chunks)
+            self.chunks = []
+        if self.file is None:
+            self.chunks.append(data)
+        else:
+            self.file.write(data)
+        return len(data)
+
+    def tell(self):
+        # joblib aligns numpy arrays on the current offset
+        return self.size
+
+    def flush(self):
+        pass
+
+    def hexdigest(self):
+        return self.digest.hexdigest()
+
+    def persist(self):
+        if self.file is None:
+            self.file = open(self.path, "wb")
+            self.file.writelines(self.chunks)
+            self.chunks = []
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+
+    def close(self):
+        self.chunks = []
+        if self.file is not None:
+            self.file.close()
+
 
 class ModelRegistry:
     """
@@ -13,53 +107,323 @@ class ModelRegistry:
     Directory layout (root = "registry"):
 
       registry/
+        blobs/
+          <sha256>             (model.joblib bytes)
+          <sha256>/            (compiled/ directory: header.json + *.npy)
         versions/
           1.0.0/
-            model.joblib
+            model.joblib -> ../../blobs/<sha256>
+            compiled -> ../../blobs/<sha256>   (memory-mappable arrays,
+                                                see compiled_model.py)
             metadata.json
           1.1.0/
-            model.joblib
-            metadata.json
-        latest/
-          model.joblib
-          metadata.json
+            ...
+        latest -> versions/1.1.0   (symlink to the last published version)
+        index.json             (version list, semver order, latest, metadata)
+
+    Artifacts are content-addressed: save_model() hashes what it writes
+    and stores it once under blobs/<sha256>, so re-saving identical bytes
+    under a new version skips the write. Versions saved before this layout
+    (plain files in the version directory) are still read.
+
+    Publishing is atomic: every file is written to a temp name and moved
+    into place with os.replace, a new version directory is assembled under
+    registry/.staging/ and moved into versions/ once complete, and `latest`
+    is a symlink that is swapped with os.replace, so a serving API never
+    reads a half-written artifact. Version directories without a
+    metadata.json are not listed.
+
+    list_versions() / get_latest_version() / get_metadata() are served from
+    index.json. save_model() updates it atomically; readers rebuild it only
+    when the mtime of registry/versions/ changes (a version was added or
+    removed outside save_model).
+
+    Loaded models are kept in an in-process LRU cache (see ModelCache),
+    keyed by blob hash (by version for legacy artifacts) and invalidated
+    when the artifact changes on disk. Two versions with identical bytes
+    share one loaded instance. The cache is bounded by entry count and,
+    with `cache_bytes`, by estimated model memory; the latest version and
+    `pinned_versions` are exempt from eviction.
+
+    For the versions listed in `compiled_versions` ("*" = all, the
+    default; empty = always joblib), get_model() loads the compiled/
+    artifact when it exists: the arrays are opened with
+    np.load(mmap_mode="r"), so every worker process shares the same
+    page-cache pages and loading is close to instant. Other versions are
+    loaded from model.joblib.
+
+    aget_model() / alist_versions() / aget_metadata() (and friends) are
+    awaitable versions of the blocking calls: they run on a dedicated
+    executor of `io_workers` threads, so async handlers browsing a slow
+    registry volume cannot starve the threadpool serving predictions.
     """
 
-    def __init__(self, root: str = "registry"):
+    # Artifacts up to this size are hashed in memory before anything is
+    # written to blobs/ (see _store_blob_file)
+    SPOOL_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, root: str = "registry", cache_size: int = 8,
+                 compiled_versions="*", cache_bytes: int = None, pinned_versions=(),
+                 io_workers: int = 4):
         self.root = Path(root)
         self.versions_dir = self.root / "versions"
+        self.blobs_dir = self.root / "blobs"
         self.latest_dir = self.root / "latest"
         self.versions_dir.mkdir(parents=True, exist_ok=True)
-        self.latest_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.root / "index.json"
+
+        self._index = None
+        self._index_signature = None
+        self._index_lock = threading.Lock()
+
+        # Pinned versions (and the latest one) are never evicted from the
+        # model cache, even when it is over `cache_bytes`.
+        self.pinned_versions = {v for v in pinned_versions if v}
+        self.model_cache = ModelCache(
+            max_entries=cache_size, max_bytes=cache_bytes, pinned=self._pinned_cache_keys
+        )
+        self._metadata_cache = {}
+
+        # Last seen artifact signature per cache key, used to tell listeners
+        # (e.g. the API's prediction cache) that a version was re-published.
+        self._signatures = {}
+        self._signatures_lock = threading.Lock()
+        self._change_listeners = []
+        self._load_listeners = []
+
+        # Dedicated executor behind the a*() async methods, created lazily
+        self.io_workers = io_workers
+        self._io_executor = None
+        self._io_lock = threading.Lock()
+
+        if isinstance(compiled_versions, str):
+            compiled_versions = {v.strip() for v in compiled_versions.split(",") if v.strip()}
+        self.compiled_versions = set(compiled_versions)
 
     # -------------------------------------------------------------------------
     # Save model + metadata
     # -------------------------------------------------------------------------
-    def save_model(self, version: str, model, metadata: dict):
+    def save_model(self, version: str, model, metadata: dict,
+                   compression: str = "none", compression_level: int = 3):
         """
         Save model + metadata under registry/versions/<version>/
-        and update registry/latest/ with the same contents.
+        and point registry/latest at it.
+
+        `compression` / `compression_level` select the joblib codec for
+        model.joblib (see COMPRESSION_CODECS): smaller artifacts cost dump
+        and load time. The choice is recorded in metadata.json; measure the
+        trade-off with benchmarks/bench_compression.py.
+
+        Artifacts are stored once under blobs/<sha256> and linked from
+        the version directory; metadata.json is written last. Every step is
+        atomic and the model is serialized only once. The compiled artifact
+        is only linked after it reproduced the pipeline exactly.
+
+        A new version is assembled under .staging/ and moved into versions/
+        as the last step, so readers never see it without its artifacts;
+        .staging/ is removed again once no other save is using it.
+        Re-publishing an existing version swaps its files in place.
         """
 
+        compress = joblib_compress_arg(compression, compression_level)
+
         # --- Save versioned directory ---
         version_dir = self.versions_dir / version
-        version_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            is_new = not any(version_dir.iterdir())  # missing or empty
+        except FileNotFoundError:
+            is_new = True
+        if is_new:
+            # Same depth as versions/<version>, so the relative blob links
+            # resolve both here and after the move
+            build_dir = self.root / ".staging" / f"{version}.{os.getpid()}.{uuid.uuid4().hex}"
+            build_dir.mkdir(parents=True)
+        else:
+            build_dir = version_dir
 
-        model_path = version_dir / "model.joblib"
-        metadata_path = version_dir / "metadata.json"
+        try:
+            metadata = self._write_version(build_dir, version, model, metadata, compress)
+            if is_new:
+                # Replaces an empty directory, fails if another writer
+                # published this version meanwhile
+                os.replace(build_dir, version_dir)
+        finally:
+            if is_new:
+                shutil.rmtree(build_dir, ignore_errors=True)
+                try:
+                    build_dir.parent.rmdir()
+                except OSError:
+                    pass  # another writer is still staging a version
+
+        # --- Point latest alias at this version ---
+        self._point_latest_to(version)
+
+        # --- Update index.json ---
+        self._update_index(version, metadata)
 
-        joblib.dump(model, model_path)
-        metadata_path.write_text(json.dumps(metadata, indent=2))
+        print(f"[registry] Saved version {version}")
+        print(f"[registry] Updated latest model alias")
 
-        # --- Save latest alias ---
-        latest_model_path = self.latest_dir / "model.joblib"
-        latest_metadata_path = self.latest_dir / "metadata.json"
+    def _write_version(self, version_dir: Path, version: str, model, metadata: dict, compress):
+        """
+        Store the artifacts of `model` as blobs, link them from `version_dir`
+        and write metadata.json last. Returns the metadata written.
+        """
+        artifacts = {}
 
-        joblib.dump(model, latest_model_path)
-        latest_metadata_path.write_text(json.dumps(metadata, indent=2))
+        artifacts["model.joblib"] = self._store_blob_file(
+            lambda f: joblib.dump(model, f, compress=compress)
+        )
+        self._link_blob(version_dir / "model.joblib", artifacts["model.joblib"])
 
-        print(f"[registry] Saved version {version}")
-        print(f"[registry] Updated latest model alias")
+        # --- Save memory-mappable artifact (when it reproduces the pipeline) ---
+        compiled_path = version_dir / "compiled"
+        try:
+            artifacts["compiled"] = self._store_compiled(model)
+        except ValueError as ex:
+            print(f"[registry] Skipped compiled artifact for {version}: {ex}")
+            # Never leave a previous save's artifact next to the new model
+            if compiled_path.is_symlink():
+                compiled_path.unlink()
+            elif compiled_path.is_dir():
+                shutil.rmtree(compiled_path)
+        else:
+            self._link_blob(compiled_path, artifacts["compiled"])
+
+        metadata = {
+            **metadata,
+            "artifacts": artifacts,
+            "compression": {
+                "codec": compress[0] if compress else "none",
+                "level": compress[1] if compress else None,
+            },
+        }
+
+        self._atomic_write(
+            version_dir / "metadata.json",
+            lambda f: f.write(json.dumps(metadata, indent=2).encode())
+        )
+        return metadata
+
+    @staticmethod
+    def _atomic_write(path: Path, write):
+        """
+        Call `write(fileobj)` on a temp file next to `path`, fsync it and
+        move it into place with os.replace (atomic on POSIX).
+        """
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                write(f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    # -------------------------------------------------------------------------
+    # Content-addressed blob store
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def _hash_file(path: Path):
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _store_blob_file(self, write):
+        """
+        Write a file via `write(fileobj)`, and store it as blobs/<sha256>
+        unless a blob with the same content already exists. Returns the hash.
+
+        The content is hashed while it is written and kept in memory (up to
+        SPOOL_BYTES, spilling to a temp file in blobs/ beyond that), so
+        re-saving an existing artifact does not touch the disk.
+        """
+        self.blobs_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.blobs_dir / f".tmp-{os.getpid()}-{uuid.uuid4().hex}"
+        sink = _HashingSpool(tmp_path, self.SPOOL_BYTES)
+        try:
+            write(sink)
+
+            sha = sink.hexdigest()
+            blob_path = self.blobs_dir / sha
+            if blob_path.exists():
+                print(f"[registry] Reusing existing blob {sha[:12]}")
+            else:
+                sink.persist()
+                os.replace(tmp_path, blob_path)
+            return sha
+        finally:
+            sink.close()
+            tmp_path.unlink(missing_ok=True)
+
+    def _store_blob_dir(self, save):
+        """
+        Write a directory via `save(path)`, and store it as blobs/<sha256>
+        (hash over its sorted file names + file hashes) unless it exists.
+        """
+        self.blobs_dir.mkdir(parents=True, exist_ok=True)
+        tmp_dir = self.blobs_dir / f".tmp-{os.getpid()}-{uuid.uuid4().hex}"
+        try:
+            save(tmp_dir)
+
+            digest = hashlib.sha256()
+            for child in sorted(tmp_dir.iterdir()):
+                digest.update(f"{child.name}\0{self._hash_file(child)}\n".encode())
+            sha = digest.hexdigest()
+
+            blob_path = self.blobs_dir / sha
+            if blob_path.exists():
+                print(f"[registry] Reusing existing blob {sha[:12]}")
+            else:
+                try:
+                    os.replace(tmp_dir, blob_path)
+                except OSError:
+                    # Another writer stored the same content concurrently
+                    if not blob_path.exists():
+                        raise
+            return sha
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def _link_blob(self, path: Path, sha: str):
+        """
+        Atomically point `path` (inside a version directory) at blobs/<sha>.
+        """
+        tmp_link = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp_link.unlink(missing_ok=True)
+        os.symlink(Path("..") / ".." / "blobs" / sha, tmp_link)
+
+        if path.is_dir() and not path.is_symlink():
+            shutil.rmtree(path)  # legacy in-place compiled/ directory
+        os.replace(tmp_link, path)
+
+    @staticmethod
+    def _content_hash(path: Path):
+        """
+        Blob hash an artifact path links to, or None for plain files.
+        """
+        if not path.is_symlink():
+            return None
+        target = Path(os.readlink(path))
+        return target.name if target.parent.name == "blobs" else None
+
+    def _point_latest_to(self, version: str):
+        """
+        Atomically swap the registry/latest symlink to versions/<version>.
+
+        A legacy latest/ directory holding a full copy is removed once.
+        """
+        tmp_link = self.root / f".latest.{os.getpid()}.tmp"
+        tmp_link.unlink(missing_ok=True)
+        os.symlink(Path("versions") / version, tmp_link, target_is_directory=True)
+
+        if self.latest_dir.is_dir() and not self.latest_dir.is_symlink():
+            shutil.rmtree(self.latest_dir)
+        os.replace(tmp_link, self.latest_dir)
 
     # -------------------------------------------------------------------------
     # Load specific model
@@ -68,14 +432,23 @@ class ModelRegistry:
         """
         Load model + metadata for a specific version from:
           registry/versions/<version>/
+
+        Uses the memory-mapped compiled/ artifact when it exists (and the
+        version is enabled in `compiled_versions`), otherwise model.joblib.
+        """
+        if self.use_compiled(version):
+            return self.get_compiled_model(version)
+        return self.get_joblib_model(version)
+
+    def get_joblib_model(self, version: str):
+        """
+        Load the sklearn pipeline (model.joblib) + metadata for a version.
         """
         version_dir = self.versions_dir / version
         model_path = version_dir / "model.joblib"
-        metadata_path = version_dir / "metadata.json"
 
-        model = joblib.load(model_path)
-        metadata = json.loads(metadata_path.read_text())
-        return model, metadata
+        return self._load_cached(version, "joblib", model_path, model_path,
+                                 version_dir / "metadata.json", joblib.load)
 
     # -------------------------------------------------------------------------
     # Load "latest" model (alias)
@@ -88,7 +461,7 @@ class ModelRegistry:
         - Uses get_latest_version() to determine the latest version by name.
         - Then delegates to get_model(version).
 
-        If no versions exist, falls back to registry/latest/ as a raw alias.
+        If no versions exist, falls back to the registry/latest alias.
         """
         versions = self.list_versions()
         if versions:
@@ -99,9 +472,348 @@ class ModelRegistry:
         model_path = self.latest_dir / "model.joblib"
         metadata_path = self.latest_dir / "metadata.json"
 
-        model = joblib.load(model_path)
+        return self._load_cached("latest", "joblib", model_path, model_path,
+                                 metadata_path, joblib.load)
+
+    # -------------------------------------------------------------------------
+    # Compiled (sklearn-free) scorer
+    # -------------------------------------------------------------------------
+    def export_compiled(self, version: str):
+        """
+        Flatten the sklearn pipeline of `version` into NumPy arrays under
+        registry/versions/<version>/compiled/ (see compiled_model.py).
+
+        Raises ValueError, without linking anything, when the pipeline
+        cannot be compiled or the result does not match it exactly.
+        Returns the CompiledLinearModel that was written.
+        """
+        model, _ = self.get_joblib_model(version)
+        sha = self._store_compiled(model)
+        self._link_blob(self.versions_dir / version / "compiled", sha)
+        print(f"[registry] Exported compiled scorer for version {version}")
+        return CompiledLinearModel.load(self.blobs_dir / sha)
+
+    def _store_compiled(self, model):
+        """
+        Export `model`, store it as a blob and check that the stored arrays
+        reproduce the pipeline (check_matches) before anything links to
+        them. Returns the blob hash; raises ValueError on any mismatch.
+        """
+        sha = self._store_blob_dir(export_pipeline(model).save)
+        check_matches(model, CompiledLinearModel.load(self.blobs_dir / sha))
+        return sha
+
+    def has_compiled(self, version: str):
+        return (self.versions_dir / version / "compiled" / HEADER_FILE).exists()
+
+    def use_compiled(self, version: str):
+        selected = "*" in self.compiled_versions or version in self.compiled_versions
+        return selected and self.has_compiled(version)
+
+    def get_compiled_model(self, version: str):
+        """
+        Load (CompiledLinearModel, metadata) for a version that has a
+        compiled/ artifact. Arrays are memory-mapped read-only; sklearn is
+        not imported.
+        """
+        version_dir = self.versions_dir / version
+        compiled_dir = version_dir / "compiled"
+
+        return self._load_cached(version, "compiled", compiled_dir, compiled_dir / HEADER_FILE,
+                                 version_dir / "metadata.json",
+                                 lambda path: CompiledLinearModel.load(path, mmap=True))
+
+    # -------------------------------------------------------------------------
+    # Artifact identity
+    # -------------------------------------------------------------------------
+    def _artifact_paths(self, version: str):
+        """
+        (kind, artifact path, file to stat) that get_model(version) loads.
+        """
+        version_dir = self.versions_dir / version
+        if self.use_compiled(version):
+            compiled_dir = version_dir / "compiled"
+            return "compiled", compiled_dir, compiled_dir / HEADER_FILE
+        model_path = version_dir / "model.joblib"
+        return "joblib", model_path, model_path
+
+    def _artifact_key(self, version: str, kind: str, artifact_path: Path):
+        """
+        Model cache key: the blob hash for content-addressed artifacts (so
+        versions with identical bytes share one loaded instance), otherwise
+        "<version>:<kind>".
+        """
+        content = self._content_hash(artifact_path)
+        return f"sha256:{content}" if content else f"{version}:{kind}"
+
+    def artifact_signature(self, version: str):
+        """
+        Identity of what get_model(version) loads (blob hash + mtime/size of
+        the artifact and metadata.json); changes whenever the version is
+        re-published.
+        """
+        kind, artifact_path, stat_path = self._artifact_paths(version)
+        return (self._content_hash(artifact_path),
+                self._file_signature(stat_path),
+                self._file_signature(self.versions_dir / version / "metadata.json"))
+
+    def _pinned_cache_keys(self):
+        """
+        Model cache keys of the latest version and the pinned versions.
+        """
+        try:
+            targets = [(v, *self._artifact_paths(v)[:2])
+                       for v in {self.get_latest_version(), *self.pinned_versions}]
+        except ValueError:
+            # No versions yet: the registry/latest alias is all there is
+            targets = [("latest", "joblib", self.latest_dir / "model.joblib")]
+
+        keys = set()
+        for version, kind, artifact_path in targets:
+            try:
+                keys.add(self._artifact_key(version, kind, artifact_path))
+            except OSError:
+                continue
+        return keys
+
+    def is_loaded(self, version: str):
+        """True if the version's artifact is currently held in the model cache."""
+        try:
+            kind, artifact_path, _ = self._artifact_paths(version)
+        except OSError:
+            return False
+        return self._artifact_key(version, kind, artifact_path) in self.model_cache
+
+    # -------------------------------------------------------------------------
+    # Cached loading
+    # -------------------------------------------------------------------------
+    def _load_cached(self, version: str, kind: str, artifact_path: Path, stat_path: Path,
+                     metadata_path: Path, load):
+        """
+        Return (model, metadata), loading the model from disk only on a
+        cache miss or when the artifact changed since it was cached.
+
+        Models are cached by blob hash when the artifact lives in blobs/,
+        otherwise by version. Metadata is cached per file signature.
+
+        The returned objects are shared between requests: treat them as
+        read-only.
+        """
+        content = self._content_hash(artifact_path)
+        artifact_signature = (content, self._file_signature(stat_path))
+        metadata_signature = self._file_signature(metadata_path)
+        self._note_signature(f"{version}:{kind}", version,
+                             (artifact_signature, metadata_signature))
+
+        def timed_load():
+            start = time.perf_counter()
+            model = load(artifact_path)
+            elapsed = time.perf_counter() - start
+            for callback in self._load_listeners:
+                callback(version, kind, elapsed)
+            return model
+
+        cache_key = f"sha256:{content}" if content else f"{version}:{kind}"
+        model = self.model_cache.get_or_load(cache_key, artifact_signature, timed_load)
+        return model, self._read_metadata(metadata_path, metadata_signature)
+
+    def _read_metadata(self, metadata_path: Path, signature):
+        cached = self._metadata_cache.get(metadata_path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
         metadata = json.loads(metadata_path.read_text())
-        return model, metadata
+        self._metadata_cache[metadata_path] = (signature, metadata)
+        return metadata
+
+    # -------------------------------------------------------------------------
+    # Change notifications
+    # -------------------------------------------------------------------------
+    def add_change_listener(self, callback):
+        """
+        Register `callback(version)`, called when a version's artifact is
+        seen with a different signature (mtime/size) than before, i.e. it
+        was re-published on disk.
+        """
+        self._change_listeners.append(callback)
+
+    def add_load_listener(self, callback):
+        """
+        Register `callback(version, kind, seconds)`, called after every
+        model load from disk (cache miss); kind is "joblib" or "compiled".
+        """
+        self._load_listeners.append(callback)
+
+    def check_artifact(self, version: str):
+        """
+        Record the signature of what get_model(version) would load, without
+        loading it, and notify change listeners if it differs from the last
+        one seen. For processes whose models live elsewhere (the inference
+        pool workers), so their listeners still see re-published versions.
+        """
+        version_dir = self.versions_dir / version
+        kind, artifact_path, stat_path = self._artifact_paths(version)
+        artifact_signature = (self._content_hash(artifact_path), self._file_signature(stat_path))
+        self._note_signature(f"{version}:{kind}", version,
+                             (artifact_signature, self._file_signature(version_dir / "metadata.json")))
+
+    def _note_signature(self, key: str, version: str, signature):
+        with self._signatures_lock:
+            previous = self._signatures.get(key)
+            self._signatures[key] = signature
+
+        if previous is not None and previous != signature:
+            for callback in self._change_listeners:
+                callback(version)
+
+    @staticmethod
+    def _file_signature(path: Path):
+        """
+        (mtime_ns, size) of a file; raises FileNotFoundError if missing.
+        """
+        st = path.stat()
+        return st.st_mtime_ns, st.st_size
+
+    def cache_stats(self):
+        """
+        Hit / miss / eviction counters, byte usage and budget of the
+        in-process model cache.
+        """
+        return self.model_cache.stats()
+
+    # -------------------------------------------------------------------------
+    # Registry index (index.json)
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def _sort_versions(versions):
+        """
+        Sort versions as semantic versions (MAJOR.MINOR.PATCH), falling back
+        to a lexical sort if any version does not parse.
+        """
+        def parse_semver(v: str):
+            parts = v.split(".")
+            if len(parts) != 3:
+                raise ValueError("not semver")
+            return tuple(int(p) for p in parts)
+
+        try:
+            return sorted(versions, key=parse_semver)
+        except Exception:
+            return sorted(versions)
+
+    def _build_index(self, versions_dir_mtime_ns: int):
+        """
+        Scan registry/versions/ and read every metadata.json (slow path).
+
+        Directories without metadata.json (a version still being copied in)
+        are left out and recorded as "incomplete", so the index is rebuilt
+        once their metadata appears.
+        """
+        versions, incomplete = [], []
+        for child in sorted(self.versions_dir.iterdir()):
+            if child.is_dir():
+                complete = (child / "metadata.json").exists()
+                (versions if complete else incomplete).append(child.name)
+        semver_order = self._sort_versions(versions)
+
+        metadata = {}
+        for v in versions:
+            try:
+                metadata[v] = json.loads((self.versions_dir / v / "metadata.json").read_text())
+            except Exception:
+                # Broken / missing metadata: get_metadata() will raise for it
+                continue
+
+        return {
+            "versions_dir_mtime_ns": versions_dir_mtime_ns,
+            "versions": versions,
+            "semver_order": semver_order,
+            "latest": semver_order[-1] if semver_order else None,
+            "metadata": metadata,
+            "incomplete": incomplete,
+        }
+
+    def _write_index(self, index: dict):
+        """
+        Atomically replace index.json (temp file + os.replace). Failures
+        (e.g. a read-only volume) are ignored: the index is only a cache.
+        """
+        try:
+            self._atomic_write(
+                self.index_path, lambda f: f.write(json.dumps(index, indent=2).encode())
+            )
+        except OSError:
+            pass
+
+    def _get_index(self):
+        """
+        Return the registry index, using (in order):
+          1. the in-memory copy, if versions/ and index.json are unchanged
+          2. index.json on disk, if it was built for the current versions/ mtime
+          3. a fresh scan of versions/ (then written back to index.json)
+        An index is also stale once an incomplete version got its metadata.
+        """
+        dir_mtime_ns = self.versions_dir.stat().st_mtime_ns
+        try:
+            index_signature = self._file_signature(self.index_path)
+        except FileNotFoundError:
+            index_signature = None
+
+        with self._index_lock:
+            if (self._index is not None
+                    and self._index["versions_dir_mtime_ns"] == dir_mtime_ns
+                    and self._index_signature == index_signature
+                    and not self._completed_since(self._index)):
+                return self._index
+
+            index = None
+            if index_signature is not None:
+                try:
+                    index = json.loads(self.index_path.read_text())
+                except Exception:
+                    index = None
+                if index is not None and (index.get("versions_dir_mtime_ns") != dir_mtime_ns
+                                          or self._completed_since(index)):
+                    index = None
+
+            if index is None:
+                index = self._build_index(dir_mtime_ns)
+                self._write_index(index)
+                try:
+                    index_signature = self._file_signature(self.index_path)
+                except FileNotFoundError:
+                    index_signature = None
+
+            self._index = index
+            self._index_signature = index_signature
+            return index
+
+    def _completed_since(self, index: dict):
+        return any((self.versions_dir / v / "metadata.json").exists()
+                   for v in index.get("incomplete", ()))
+
+    def _update_index(self, version: str, metadata: dict):
+        """
+        Add / refresh one version in index.json after save_model().
+        """
+        with self._index_lock:
+            self._index = None
+
+        index = self._get_index()
+        versions = sorted(set(index["versions"]) | {version})
+        semver_order = self._sort_versions(versions)
+        index = {
+            "versions_dir_mtime_ns": self.versions_dir.stat().st_mtime_ns,
+            "versions": versions,
+            "semver_order": semver_order,
+            "latest": semver_order[-1],
+            "metadata": {**index["metadata"], version: metadata},
+            "incomplete": [v for v in index.get("incomplete", ()) if v != version],
+        }
+
+        with self._index_lock:
+            self._write_index(index)
+            self._index = None
 
     # -------------------------------------------------------------------------
     # NEW: list available versions
@@ -112,19 +824,15 @@ class ModelRegistry:
 
           registry/versions/
 
-        Only directories are considered; file names are ignored.
+        Only directories with a metadata.json are considered; file names
+        and versions still being written are ignored.
+        Served from the registry index (no directory scan unless
+        registry/versions/ changed).
         """
         if not self.versions_dir.exists():
             return []
 
-        versions = []
-        for child in self.versions_dir.iterdir():
-            if child.is_dir():
-                versions.append(child.name)
-
-        # Sort lexically by default; you can swap this later for semantic sort.
-        versions.sort()
-        return versions
+        return list(self._get_index()["versions"])
 
     # -------------------------------------------------------------------------
     # NEW: get latest version name
@@ -138,40 +846,85 @@ class ModelRegistry:
           e.g. "1.0.0", "1.2.3"
         - If parsing fails for any version, fall back to simple lexical sort.
 
+        The sorted order and latest pointer are precomputed in the index.
+
         Returns:
           - latest version string (e.g. "1.1.0"), or
           - raises ValueError if no versions exist.
         """
-        versions = self.list_versions()
-        if not versions:
+        latest = self._get_index()["latest"]
+        if latest is None:
             raise ValueError("No versions found in registry")
-
-        def parse_semver(v: str):
-            parts = v.split(".")
-            if len(parts) != 3:
-                raise ValueError("not semver")
-            return tuple(int(p) for p in parts)
-
-        # Try semantic version sort first
-        try:
-            versions_sorted = sorted(versions, key=parse_semver)
-        except Exception:
-            # Fallback to lexical sort
-            versions_sorted = sorted(versions)
-
-        return versions_sorted[-1]
+        return latest
 
     # -------------------------------------------------------------------------
     # NEW: get metadata for a specific version
     # -------------------------------------------------------------------------
     def get_metadata(self, version: str):
         """
-        Read and return metadata.json for a specific version without
-        loading the model.
+        Return metadata for a specific version without loading the model.
 
-        Path:
-          registry/versions/<version>/metadata.json
+        Served from the metadata inlined in the registry index; falls back
+        to reading registry/versions/<version>/metadata.json.
+        The returned dict is shared: treat it as read-only.
         """
+        metadata = self._get_index()["metadata"].get(version)
+        if metadata is not None:
+            return metadata
+
         version_dir = self.versions_dir / version
         metadata_path = version_dir / "metadata.json"
-        return json.loads(metadata_path.read_text())
\ No newline at end of file
+        return json.loads(metadata_path.read_text())
+
+    def get_latest_metadata(self):
+        """
+        Metadata of what get_latest_model() loads, without loading the
+        model: the latest version's, or the registry/latest alias's when no
+        versions exist.
+        """
+        if self.list_versions():
+            return self.get_metadata(self.get_latest_version())
+
+        metadata_path = self.latest_dir / "metadata.json"
+        return self._read_metadata(metadata_path, self._file_signature(metadata_path))
+
+    # -------------------------------------------------------------------------
+    # Async API (for the event loop)
+    # -------------------------------------------------------------------------
+    def _get_io_executor(self):
+        with self._io_lock:
+            if self._io_executor is None:
+                self._io_executor = ThreadPoolExecutor(
+                    max_workers=self.io_workers, thread_name_prefix="registry-io"
+                )
+            return self._io_executor
+
+    async def _run_io(self, fn, *args):
+        """
+        Run a blocking registry call on the dedicated registry I/O executor,
+        so slow volumes never occupy the server's request threadpool.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_io_executor(), functools.partial(fn, *args))
+
+    async def aget_model(self, version: str):
+        return await self._run_io(self.get_model, version)
+
+    async def aget_latest_model(self):
+        return await self._run_io(self.get_latest_model)
+
+    async def alist_versions(self):
+        return await self._run_io(self.list_versions)
+
+    async def aget_latest_version(self):
+        return await self._run_io(self.get_latest_version)
+
+    async def aget_metadata(self, version: str):
+        return await self._run_io(self.get_metadata, version)
+
+    def close(self):
+        """Shut down the registry I/O executor (if it was started)."""
+        with self._io_lock:
+            executor, self._io_executor = self._io_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
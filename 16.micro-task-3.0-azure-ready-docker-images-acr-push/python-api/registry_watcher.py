@@ -0,0 +1,224 @@
+# registry_watcher.py - Background hot-reload of registry versions
+
+import threading
+
+from warmup import warm_model
+
+# inotify is optional (Linux only); without it the watcher polls
+try:
+    from inotify_simple import INotify, flags
+except ImportError:
+    INotify = None
+    flags = None
+
+
+class RegistryWatcher:
+    """
+    Watches registry/ for new or re-published versions and brings them
+    live without a restart or a cold-load spike on the request path.
+
+    On every change (inotify event, or every `poll_interval` seconds when
+    polling) the watcher:
+      1. compares each version's artifact signature with the last snapshot
+      2. loads + warms the new latest version, and reloads changed versions
+         that are currently held in the model cache
+      3. only then swaps `latest_version`, which the API uses instead of
+         resolving the latest version per request
+
+    Polling cycles are cheap: step 1 only runs when the mtime of
+    registry/versions/ or index.json changed, and then only for the versions
+    whose index entry changed. inotify events, and every
+    `full_scan_every`-th cycle, re-check every version (e.g. files copied
+    into an existing version directory outside save_model).
+
+    With an InferencePool (`pool`), models live in the worker processes:
+    step 2 runs there (pool.reload), and the API process only records the
+    new artifact signatures so its change listeners still fire.
+    """
+
+    def __init__(self, registry, poll_interval: float = 2.0,
+                 warm_predictions: int = 3, use_inotify: bool = True, pool=None,
+                 full_scan_every: int = 30):
+        self.registry = registry
+        self.pool = pool
+        self.full_scan_every = max(1, full_scan_every)
+        self.poll_interval = poll_interval
+        self.warm_predictions = warm_predictions
+        self.mode = "inotify" if (use_inotify and INotify is not None) else "polling"
+
+        self.latest_version = None
+        self.checks = 0
+        self.reloads = 0
+        self.swaps = 0
+        self.last_error = None
+
+        self._snapshot = {}
+        self._marker = None
+        self._entries = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+    def start(self):
+        # Current state is the baseline: startup warm-up loads it
+        if self.registry.list_versions():
+            self.latest_version = self.registry.get_latest_version()
+        self._marker = self._registry_marker()
+        self._entries = self._index_entries()
+        self._snapshot = self._take_snapshot()
+
+        self._thread = threading.Thread(target=self._run, name="registry-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval + 1)
+
+    def _run(self):
+        inotify = self._open_inotify() if self.mode == "inotify" else None
+
+        while not self._stop.is_set():
+            events = None
+            if inotify is not None:
+                # Wake up on any event, but still re-check periodically so
+                # changes inside version directories are never missed
+                events = inotify.read(timeout=int(self.poll_interval * 1000), read_delay=100)
+                self._watch_version_dirs(inotify)
+            else:
+                self._stop.wait(self.poll_interval)
+
+            if self._stop.is_set():
+                break
+
+            try:
+                full = bool(events) or (self.checks + 1) % self.full_scan_every == 0
+                self.check(full=full)
+                self.last_error = None
+            except Exception as ex:
+                self.last_error = str(ex)
+
+        if inotify is not None:
+            inotify.close()
+
+    def _open_inotify(self):
+        try:
+            inotify = INotify()
+            mask = (flags.CREATE | flags.DELETE | flags.MOVED_TO
+                    | flags.MOVED_FROM | flags.CLOSE_WRITE)
+            self._mask = mask
+            self._watched = set()
+            inotify.add_watch(str(self.registry.root), mask)
+            inotify.add_watch(str(self.registry.versions_dir), mask)
+            self._watch_version_dirs(inotify)
+            return inotify
+        except OSError:
+            self.mode = "polling"
+            return None
+
+    def _watch_version_dirs(self, inotify):
+        for version in self.registry.list_versions():
+            if version in self._watched:
+                continue
+            try:
+                inotify.add_watch(str(self.registry.versions_dir / version), self._mask)
+                self._watched.add(version)
+            except OSError:
+                continue
+
+    # -------------------------------------------------------------------------
+    # Change detection
+    # -------------------------------------------------------------------------
+    def _registry_marker(self):
+        """
+        mtimes of registry/versions/ and index.json: one of them changes
+        whenever save_model publishes or a version directory is added.
+        """
+        try:
+            index_mtime_ns = self.registry.index_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            index_mtime_ns = None
+        return self.registry.versions_dir.stat().st_mtime_ns, index_mtime_ns
+
+    def _index_entries(self):
+        return {v: self.registry.get_metadata(v) for v in self.registry.list_versions()}
+
+    def _take_snapshot(self, only=None):
+        """
+        Artifact signature per version; with `only`, just those versions
+        are re-signed and the others keep their previous signature.
+        """
+        versions = self.registry.list_versions()
+        snapshot = {}
+        if only is not None:
+            snapshot = {v: sig for v, sig in self._snapshot.items()
+                        if v in versions and v not in only}
+            versions = [v for v in versions if v in only]
+        for version in versions:
+            try:
+                snapshot[version] = self.registry.artifact_signature(version)
+            except FileNotFoundError:
+                # Version still being copied in: picked up on a later check
+                continue
+        return snapshot
+
+    def check(self, full: bool = True):
+        """
+        Run one detection cycle (also callable directly, e.g. from tests).
+        With full=False, nothing is re-checked unless versions/ or
+        index.json changed, and then only versions whose index entry did.
+        """
+        self.checks += 1
+        marker = self._registry_marker()
+        if not full and marker == self._marker:
+            return
+
+        entries = self._index_entries()
+        if full:
+            snapshot = self._take_snapshot()
+        else:
+            snapshot = self._take_snapshot(
+                only={v for v, entry in entries.items() if self._entries.get(v) != entry}
+            )
+        changed = [v for v, sig in snapshot.items() if self._snapshot.get(v) != sig]
+
+        latest = self.registry.get_latest_version() if snapshot else None
+
+        for version in changed:
+            if self.pool is not None:
+                self.registry.check_artifact(version)
+                if self.pool.reload(version, force=version == latest):
+                    self.reloads += 1
+            elif version == latest or self.registry.is_loaded(version):
+                model, _ = self.registry.get_model(version)
+                warm_model(model, self.warm_predictions)
+                self.reloads += 1
+
+        if latest is not None and latest != self.latest_version:
+            if latest not in snapshot:
+                return  # latest not fully written yet; retry next cycle
+            # Model is loaded and warm: publish the new pointer
+            self.latest_version = latest
+            self.swaps += 1
+
+        self._snapshot = snapshot
+        # Versions still being copied in stay "changed" until they are signed
+        self._entries = {v: entry for v, entry in entries.items() if v in snapshot}
+        if len(self._entries) == len(entries):
+            self._marker = marker
+
+    # -------------------------------------------------------------------------
+    # Introspection
+    # -------------------------------------------------------------------------
+    def stats(self):
+        return {
+            "mode": self.mode,
+            "pollIntervalSeconds": self.poll_interval,
+            "latestVersion": self.latest_version,
+            "checks": self.checks,
+            "reloads": self.reloads,
+            "swaps": self.swaps,
+            "lastError": self.last_error,
+        }
@@ -0,0 +1,162 @@
+# serve.py - Pre-fork multi-worker server with copy-on-write model sharing
+#
+# Usage (from python-api/):
+#   python serve.py --workers 4 [--host 0.0.0.0] [--port 8000] [--memory-report-seconds 60]
+#
+# The master process imports the app, loads the latest + PINNED_VERSIONS
+# models once, freezes the GC and forks the workers, which then share the
+# model pages copy-on-write instead of each importing sklearn and loading
+# every model again (as `uvicorn --workers N` does).
+
+import argparse
+import gc
+import logging
+import os
+import shutil
+import signal
+import socket
+import sys
+import tempfile
+import time
+
+import uvicorn
+
+from memory_stats import process_memory
+
+logger = logging.getLogger("python-api")
+
+
+def preload_models(registry, pinned_versions):
+    """Load latest + pinned versions into the registry's model cache."""
+    versions = list(dict.fromkeys(
+        ([registry.get_latest_version()] if registry.list_versions() else []) + list(pinned_versions)
+    ))
+    for version in versions:
+        start = time.perf_counter()
+        registry.get_model(version)
+        logger.info({
+            "msg": "Preloaded model in master",
+            "version": version,
+            "loadMs": round((time.perf_counter() - start) * 1000, 2),
+        })
+    if not versions:
+        registry.get_latest_model()
+    return versions
+
+
+def bind_socket(host: str, port: int):
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(app, sock, args):
+    """Child process: re-enable the GC and serve on the inherited socket."""
+    gc.enable()
+    config = uvicorn.Config(app, log_level=args.log_level)
+    uvicorn.Server(config).run(sockets=[sock])
+    os._exit(0)
+
+
+def fork_worker(app, sock, args):
+    pid = os.fork()
+    if pid == 0:
+        try:
+            run_worker(app, sock, args)
+        finally:
+            os._exit(1)
+    return pid
+
+
+def memory_report(master_pid, workers):
+    report = {
+        "msg": "Worker memory",
+        "master": process_memory(master_pid),
+        "workers": [process_memory(pid) for pid in workers],
+    }
+    report["totalRssKb"] = sum(w.get("rssKb", 0) for w in report["workers"])
+    report["totalPssKb"] = sum(w.get("pssKb", 0) for w in report["workers"])
+    logger.info(report)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", type=str, default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_WORKERS", "2")))
+    parser.add_argument("--memory-report-seconds", type=float,
+                        default=float(os.getenv("MEMORY_REPORT_SECONDS", "60")))
+    parser.add_argument("--log-level", type=str, default="info")
+    args = parser.parse_args()
+
+    # No collections while the shared heap is being built
+    gc.disable()
+
+    # Workers share their metrics through this directory, so /metrics on
+    # any worker reports the whole server (see Metrics)
+    metrics_dir = None
+    if not os.getenv("METRICS_DIR"):
+        metrics_dir = os.environ["METRICS_DIR"] = tempfile.mkdtemp(prefix="python-api-metrics-")
+
+    import main as api
+
+    preload_models(api.registry, api.PINNED_VERSIONS)
+    # Model loads recorded here are reported once, not by every worker
+    api.metrics.flush()
+
+    # Move everything allocated so far into the permanent generation: later
+    # collections in the workers never touch (and so never copy) these pages
+    gc.collect()
+    gc.freeze()
+
+    sock = bind_socket(args.host, args.port)
+    master_pid = os.getpid()
+    workers = {fork_worker(api.app, sock, args): i for i in range(args.workers)}
+    logger.info({"msg": "Started workers", "master": master_pid, "workers": list(workers)})
+
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    next_report = time.monotonic() + args.memory_report_seconds
+    while workers:
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            break
+
+        if pid:
+            index = workers.pop(pid, None)
+            if not stopping and index is not None:
+                logger.error({"msg": "Worker exited, restarting", "pid": pid,
+                              "exitCode": os.waitstatus_to_exitcode(status)})
+                workers[fork_worker(api.app, sock, args)] = index
+            continue
+
+        if args.memory_report_seconds > 0 and time.monotonic() >= next_report:
+            memory_report(master_pid, workers)
+            next_report = time.monotonic() + args.memory_report_seconds
+        time.sleep(0.5)
+
+    sock.close()
+    if metrics_dir is not None:
+        shutil.rmtree(metrics_dir, ignore_errors=True)
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+# test_compiled_model.py - Compiled scorer reproduces the sklearn pipeline bit-for-bit
+#
+# Usage (from python-api/):
+#   python -m pytest tests
+
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.linear_model._base import LinearClassifierMixin
+from sklearn.pipeline import Pipeline
+from sklearn.utils.extmath import softmax
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from compiled_model import CompiledLinearModel, check_matches, export_pipeline  # noqa: E402
+from text_utils import clean_text  # noqa: E402
+
+# sklearn >= 1.8 removed LogisticRegression(multi_class=...); the modes it
+# no longer offers are checked against sklearn's own probability formulas
+HAS_MULTI_CLASS = "multi_class" in LogisticRegression().get_params()
+
+VECTORIZER_OPTIONS = [
+    {},
+    {"ngram_range": (1, 2)},
+    {"sublinear_tf": True, "norm": "l1"},
+    {"binary": True, "min_df": 2, "stop_words": ["w1", "w2"]},
+    {"ngram_range": (2, 3), "norm": None},
+]
+
+
+def make_texts(n_texts, seed):
+    rng = random.Random(seed)
+    words = [f"w{i}" for i in range(400)] + ["great", "bad", "love", "hate", "ok"]
+    return [
+        " ".join(rng.choice(words) + rng.choice(["", "!", ",", " ."]) for _ in range(rng.randint(0, 40)))
+        for _ in range(n_texts)
+    ]
+
+
+TRAIN_TEXTS = make_texts(600, seed=0)
+TEST_TEXTS = make_texts(200, seed=1) + ["", "!!!", "UNKNOWN words only", "W1 w1 w1"]
+
+
+def fit_pipeline(n_classes, vectorizer_options, multi_class=None):
+    rng = random.Random(n_classes)
+    labels = [rng.choice("abc"[:n_classes]) for _ in TRAIN_TEXTS]
+    clf_options = {"multi_class": multi_class} if multi_class and HAS_MULTI_CLASS else {}
+    pipeline = Pipeline([
+        ("tfidf", TfidfVectorizer(preprocessor=clean_text, **vectorizer_options)),
+        ("clf", LogisticRegression(C=3.0, max_iter=300, **clf_options)),
+    ]).fit(TRAIN_TEXTS, labels)
+    if multi_class and not HAS_MULTI_CLASS:
+        pipeline.named_steps["clf"].multi_class = multi_class
+    return pipeline
+
+
+def expected_proba(pipeline, multi_class, texts):
+    """sklearn's probabilities for `multi_class`, also where it was removed."""
+    if HAS_MULTI_CLASS or multi_class is None:
+        return pipeline.predict_proba(texts)
+    clf = pipeline.named_steps["clf"]
+    features = pipeline.named_steps["tfidf"].transform(texts)
+    if multi_class == "ovr":
+        return LinearClassifierMixin._predict_proba_lr(clf, features)
+    scores = clf.decision_function(features)
+    return softmax(np.c_[-scores, scores] if scores.ndim == 1 else scores)
+
+
+def round_trip(compiled, tmp_path):
+    compiled.save(tmp_path / "compiled")
+    return CompiledLinearModel.load(tmp_path / "compiled", mmap=True)
+
+
+@pytest.mark.parametrize("vectorizer_options", VECTORIZER_OPTIONS)
+@pytest.mark.parametrize("n_classes, multi_class, mode", [
+    (2, None, "binary"),
+    (3, None, "multinomial"),
+    (3, "ovr", "ovr"),
+    (2, "multinomial", "multinomial"),
+])
+def test_outputs_match_pipeline(tmp_path, n_classes, multi_class, mode, vectorizer_options):
+    pipeline = fit_pipeline(n_classes, vectorizer_options, multi_class)
+    compiled = round_trip(export_pipeline(pipeline), tmp_path)
+    assert compiled.header["proba"] == mode
+
+    texts = TEST_TEXTS
+    np.testing.assert_array_equal(compiled.decision_function(texts), pipeline.decision_function(texts))
+    np.testing.assert_array_equal(compiled.predict(texts), pipeline.predict(texts))
+    np.testing.assert_array_equal(compiled.predict_proba(texts), expected_proba(pipeline, multi_class, texts))
+
+
+@pytest.mark.parametrize("batch_size", [1, 7, 64])
+def test_batches_match_single_texts(batch_size):
+    compiled = export_pipeline(fit_pipeline(3, {"ngram_range": (1, 2)}))
+    texts = TEST_TEXTS[:64]
+    batched = np.concatenate([
+        compiled.decision_function(texts[i:i + batch_size]) for i in range(0, len(texts), batch_size)
+    ])
+    np.testing.assert_array_equal(batched, compiled.decision_function(texts))
+
+
+def test_check_matches_rejects_a_different_model():
+    pipeline = fit_pipeline(2, {})
+    check_matches(pipeline, export_pipeline(pipeline))
+
+    compiled = export_pipeline(pipeline)
+    compiled.coef = compiled.coef * (1 + 1e-12)
+    with pytest.raises(ValueError, match="decision scores"):
+        check_matches(pipeline, compiled)
+
+
+def test_check_matches_rejects_wrong_probabilities():
+    pipeline = fit_pipeline(2, {})
+    compiled = export_pipeline(pipeline)
+    compiled.header = {**compiled.header, "proba": "multinomial"}
+    with pytest.raises(ValueError, match="probabilities"):
+        check_matches(pipeline, compiled)
+
+
+def tampered_export(pipeline):
+    compiled = export_pipeline(pipeline)
+    compiled.intercept = compiled.intercept + 1.0
+    return compiled
+
+
+def test_save_model_links_only_verified_exports(tmp_path, monkeypatch):
+    import registry as registry_module
+
+    registry = registry_module.ModelRegistry(tmp_path / "registry", compiled_versions="*")
+    pipeline = fit_pipeline(2, {})
+
+    registry.save_model("1.0.0", pipeline, {"version": "1.0.0"})
+    assert registry.has_compiled("1.0.0")
+    assert isinstance(registry.get_model("1.0.0")[0], CompiledLinearModel)
+
+    monkeypatch.setattr(registry_module, "export_pipeline", tampered_export)
+    registry.save_model("1.1.0", pipeline, {"version": "1.1.0"})
+    assert not registry.has_compiled("1.1.0")
+    assert "compiled" not in registry.get_metadata("1.1.0")["artifacts"]
+    assert isinstance(registry.get_model("1.1.0")[0], Pipeline)
+
+    with pytest.raises(ValueError):
+        registry.export_compiled("1.1.0")
+    assert not registry.has_compiled("1.1.0")
@@ -0,0 +1,56 @@
+# test_metrics.py - Metrics aggregated across processes through a shared directory
+#
+# Usage (from python-api/):
+#   python -m pytest tests
+
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from metrics import Metrics  # noqa: E402
+
+DEAD_PID = 2 ** 22 + 1  # above the default pid_max
+
+
+def write_process(shared_dir, pid, samples, collected=()):
+    (shared_dir / f"{pid}.json").write_text(json.dumps({"samples": samples, "collected": list(collected)}))
+
+
+def test_shared_dir_sums_processes(tmp_path):
+    metrics = Metrics(shared_dir=tmp_path)
+    metrics.counter("requests_total", "Requests")
+    metrics.gauge("in_flight", "In flight")
+    metrics.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    metrics.add_collector(lambda: [("cache_entries", "gauge", "Entries", [((), 3)])])
+
+    metrics.inc("requests_total", (("route", "/predict"),), 2)
+    metrics.inc("in_flight")
+    metrics.observe("latency_seconds", (), 0.05)
+
+    # Another live worker (the test runner's parent) and an exited one
+    write_process(tmp_path, os.getppid(), [
+        ["requests_total", [["route", "/predict"]], 5],
+        ["in_flight", [], 1],
+        ["latency_seconds", [], [0, 1, 0, 0.5]],
+    ], [["cache_entries", "gauge", "Entries", [[[], 4]]]])
+    write_process(tmp_path, DEAD_PID, [
+        ["requests_total", [["route", "/predict"]], 7],
+        ["in_flight", [], 9],
+    ], [["cache_entries", "gauge", "Entries", [[[], 100]]]])
+
+    lines = metrics.render().splitlines()
+
+    # Counters of exited processes are kept, their gauges are not
+    assert 'requests_total{route="/predict"} 14' in lines
+    assert "in_flight 2" in lines
+    assert 'latency_seconds_bucket{le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{le="1"} 2' in lines
+    assert "latency_seconds_count 2" in lines
+    # Collector samples are per live process
+    assert f'cache_entries{{pid="{os.getpid()}"}} 3' in lines
+    assert f'cache_entries{{pid="{os.getppid()}"}} 4' in lines
+    assert not any(str(DEAD_PID) in line for line in lines)
+    assert lines.count("# TYPE cache_entries gauge") == 1
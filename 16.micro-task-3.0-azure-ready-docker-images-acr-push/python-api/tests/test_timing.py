@@ -0,0 +1,78 @@
+# test_timing.py - staged_predict matches model.predict and cleans each text once
+#
+# Usage (from python-api/):
+#   python -m pytest tests
+
+import sys
+from pathlib import Path
+
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from compiled_model import export_pipeline  # noqa: E402
+from text_cache import TextCache  # noqa: E402
+from text_utils import clean_text, clean_texts, set_text_cache  # noqa: E402
+from timing import _variants, staged_predict, start_request_timing  # noqa: E402
+
+TRAIN_TEXTS = ["this is great", "I love this product", "absolutely fantastic", "really bad service",
+               "this is terrible", "I hate this", "not good at all", "pretty nice overall"]
+TRAIN_LABELS = ["positive"] * 3 + ["negative"] * 4 + ["positive"]
+TEXTS = ["This is GREAT!!", "really bad service...", "Ünïcode naïve café", "", "nice, I love it"]
+
+
+@pytest.fixture(scope="module")
+def pipeline():
+    return Pipeline([
+        ("tfidf", TfidfVectorizer(preprocessor=clean_text, ngram_range=(1, 2))),
+        ("clf", LogisticRegression()),
+    ]).fit(TRAIN_TEXTS, TRAIN_LABELS)
+
+
+@pytest.fixture(params=[False, True], ids=["no-cache", "text-cache"])
+def text_cache(request):
+    cache = TextCache(max_bytes=1_000_000) if request.param else None
+    set_text_cache(cache)
+    yield cache
+    set_text_cache(None)
+
+
+@pytest.mark.parametrize("compiled", [False, True], ids=["pipeline", "compiled"])
+def test_staged_predict_cleans_each_text_once(pipeline, text_cache, compiled):
+    model = export_pipeline(pipeline) if compiled else pipeline
+    expected = list(pipeline.predict(TEXTS))
+
+    timing = start_request_timing()
+    assert list(staged_predict(model, TEXTS)) == expected
+    assert list(timing.as_dict()) == ["clean", "transform", "score"]
+    if text_cache is not None:
+        # Cached by raw text only: no second lookup keyed by cleaned text
+        assert text_cache.stats()["entries"] == len(set(TEXTS))
+        assert text_cache.stats()["misses"] == len(set(TEXTS))
+
+    assert list(staged_predict(model, TEXTS, clean_texts(TEXTS))) == expected
+
+
+@pytest.mark.parametrize("options", [
+    {},
+    {"ngram_range": (1, 3)},
+    {"ngram_range": (2, 2), "stop_words": "english"},
+    {"token_pattern": r"(?u)\b\w+\b", "sublinear_tf": True},
+])
+def test_cached_analyzer_matches_vectorizer(options):
+    vectorizer = TfidfVectorizer(preprocessor=clean_text, **options).fit(TRAIN_TEXTS + TEXTS)
+    expected = vectorizer.transform(TEXTS)
+    cache = TextCache(max_bytes=1_000_000)
+    set_text_cache(cache)
+    try:
+        _, cached = _variants(vectorizer)
+        for _ in range(2):
+            features = cached.transform(TEXTS)
+            assert (features != expected).nnz == 0
+        # Second pass served the token lists from the cache
+        assert cache.stats()["hits"] == len(TEXTS)
+    finally:
+        set_text_cache(None)
@@ -0,0 +1,126 @@
+# text_cache.py - Shared, byte-bounded LRU cache for cleaned text and tokens
+
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+
+from text_utils import _clean_text_uncached
+
+# Rough fixed cost per entry: digest key, entry object, OrderedDict slot
+_ENTRY_OVERHEAD_BYTES = 200
+
+
+class _TextEntry:
+    __slots__ = ("cleaned", "tokens", "size")
+
+    def __init__(self, cleaned: str):
+        self.cleaned = cleaned
+        self.tokens = {}  # token pattern -> tuple of tokens
+        self.size = _ENTRY_OVERHEAD_BYTES + sys.getsizeof(cleaned)
+
+
+class TextCache:
+    """
+    LRU cache of clean_text() output and token lists, keyed by a 128-bit
+    BLAKE2b hash of the raw text.
+
+    - Shared by every model version whose preprocessor is clean_text, so a
+      text scored by several versions (or retried by the gateway) is only
+      cleaned / tokenized once.
+    - Bounded by an approximate size in bytes (`max_bytes`); least recently
+      used entries are evicted first.
+    - Tracks hits / misses so the size can be tuned from the hit ratio.
+    """
+
+    def __init__(self, max_bytes: int):
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be >= 1")
+
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(text: str) -> bytes:
+        return hashlib.blake2b(
+            text.encode("utf-8", "surrogatepass"), digest_size=16
+        ).digest()
+
+    # -------------------------------------------------------------------------
+    # Lookups
+    # -------------------------------------------------------------------------
+    def clean(self, text: str) -> str:
+        return self._entry(self._key(text), text).cleaned
+
+    def tokens(self, text: str, token_re):
+        """
+        Tokens of clean_text(text) for a compiled token pattern, as a tuple.
+        """
+        key = self._key(text)
+        entry = self._entry(key, text)
+
+        tokens = entry.tokens.get(token_re.pattern)
+        if tokens is not None:
+            return tokens
+
+        tokens = tuple(token_re.findall(entry.cleaned))
+        added = sys.getsizeof(tokens) + sum(sys.getsizeof(t) for t in tokens)
+
+        with self._lock:
+            if token_re.pattern not in entry.tokens:
+                entry.tokens[token_re.pattern] = tokens
+                entry.size += added
+                if self._entries.get(key) is entry:
+                    self.current_bytes += added
+                    self._evict_locked()
+        return tokens
+
+    def _entry(self, key: bytes, text: str) -> _TextEntry:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        # Clean outside the lock; a concurrent miss just does the work twice
+        entry = _TextEntry(_clean_text_uncached(text))
+
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing is not None:
+                return existing
+            if entry.size <= self.max_bytes:
+                self._entries[key] = entry
+                self.current_bytes += entry.size
+                self._evict_locked()
+        return entry
+
+    def _evict_locked(self):
+        while self.current_bytes > self.max_bytes and self._entries:
+            _, old = self._entries.popitem(last=False)
+            self.current_bytes -= old.size
+            self.evictions += 1
+
+    # -------------------------------------------------------------------------
+    # Introspection
+    # -------------------------------------------------------------------------
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "max_bytes": self.max_bytes,
+                "bytes": self.current_bytes,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+                "evictions": self.evictions,
+            }
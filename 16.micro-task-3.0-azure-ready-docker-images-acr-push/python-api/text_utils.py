@@ -1,5 +1,33 @@
 import re
 
+# Characters kept by clean_text (everything else is removed)
+_DISALLOWED_RE = re.compile(r"[^a-z0-9\s]+")
+
+# str.translate table deleting every ASCII character the regex above would
+# remove; derived from the same pattern so both paths stay in sync.
+_ASCII_DELETE_TABLE = {
+    i: None for i in range(128) if _DISALLOWED_RE.fullmatch(chr(i))
+}
+
+# Optional shared cache of cleaned text / tokens (see text_cache.py).
+# Disabled (None) unless the API enables it with set_text_cache().
+_text_cache = None
+
+
+def set_text_cache(cache):
+    """
+    Enable (or disable with None) the process-wide text cache used by
+    clean_text() and tokenize(). Every loaded model version whose
+    preprocessor is clean_text shares it.
+    """
+    global _text_cache
+    _text_cache = cache
+
+
+def get_text_cache():
+    return _text_cache
+
+
 def clean_text(text: str) -> str:
     """
     Basic text cleaning / normalisation.
@@ -7,8 +35,83 @@ def clean_text(text: str) -> str:
     - Lowercase
     - Remove punctuation and non-alphanumeric characters (keep letters, numbers, spaces)
     - Collapse multiple spaces into a single space and strip leading/trailing spaces
+
+    Fast path: ASCII text is filtered with a str.translate table, other text
+    with one precompiled regex; " ".join(text.split()) collapses and strips
+    whitespace in a single pass. Output is identical to the original
+    lower() + re.sub(...) + re.sub(r"\\s+", " ").strip() implementation.
+
+    When a shared text cache is enabled, results are memoized per text.
     """
+    if _text_cache is not None:
+        return _text_cache.clean(text)
+    return _clean_text_uncached(text)
+
+
+def _clean_text_uncached(text: str) -> str:
     text = text.lower()
-    text = re.sub(r"[^a-z0-9\s]", "", text)
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
+    if text.isascii():
+        text = text.translate(_ASCII_DELETE_TABLE)
+    else:
+        text = _DISALLOWED_RE.sub("", text)
+    return " ".join(text.split())
+
+
+def tokenize(text: str, token_re, cleaned: str = None) -> list:
+    """
+    clean_text(text) split into tokens with a compiled token pattern
+    (e.g. TfidfVectorizer's token_pattern). Memoized when the shared text
+    cache is enabled; callers must not mutate the returned sequence.
+
+    `cleaned` may pass in clean_text(text) when the caller already has it;
+    the cache is still keyed by the raw `text`.
+    """
+    if _text_cache is not None:
+        return _text_cache.tokens(text, token_re)
+    if cleaned is None:
+        cleaned = _clean_text_uncached(text)
+    return token_re.findall(cleaned)
+
+
+def word_ngrams(tokens, stop_words=None, ngram_range=(1, 1)) -> list:
+    """
+    Stop-word filtering + word n-grams of a token sequence, exactly as
+    TfidfVectorizer's "word" analyzer does. Does not mutate `tokens`.
+    """
+    if stop_words is not None:
+        tokens = [t for t in tokens if t not in stop_words]
+
+    min_n, max_n = ngram_range
+    if max_n != 1:
+        original_tokens = tokens
+        if min_n == 1:
+            tokens = list(original_tokens)
+            min_n += 1
+        else:
+            tokens = []
+        n_original = len(original_tokens)
+        for n in range(min_n, min(max_n + 1, n_original + 1)):
+            for i in range(n_original - n + 1):
+                tokens.append(" ".join(original_tokens[i:i + n]))
+
+    return tokens
+
+
+def clean_texts(texts) -> list:
+    """
+    Batch variant of clean_text for bulk paths: returns a list with
+    clean_text applied to every item of `texts` (any iterable). Goes
+    through the shared text cache when it is enabled.
+    """
+    if _text_cache is not None:
+        return [_text_cache.clean(text) for text in texts]
+
+    table = _ASCII_DELETE_TABLE
+    regex_sub = _DISALLOWED_RE.sub
+    cleaned = []
+    append = cleaned.append
+    for text in texts:
+        text = text.lower()
+        text = text.translate(table) if text.isascii() else regex_sub("", text)
+        append(" ".join(text.split()))
+    return cleaned
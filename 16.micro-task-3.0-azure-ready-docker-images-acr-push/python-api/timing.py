@@ -0,0 +1,159 @@
+# timing.py - Per-request stage timings (Server-Timing header + span log)
+
+import copy
+import re
+import time
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from compiled_model import CompiledLinearModel
+from text_utils import clean_text, clean_texts, get_text_cache, tokenize, word_ngrams
+
+# Timing of the request being handled; set by the API middleware. Context
+# variables are copied into threadpool workers, so sync handlers and the
+# registry (e.g. its load listeners) see the same object.
+_current = ContextVar("request_timing", default=None)
+
+
+class RequestTiming:
+    """
+    Ordered list of (stage, seconds) spans for one request, rendered as a
+    Server-Timing header value: `model;dur=0.41, clean;dur=0.02, ...`.
+    Repeated stages (e.g. one per batch chunk) are summed.
+    """
+
+    def __init__(self):
+        self.spans = []
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans.append((name, time.perf_counter() - start))
+
+    def add(self, name: str, seconds: float):
+        self.spans.append((name, seconds))
+
+    def header(self) -> str:
+        return ", ".join(f"{name};dur={ms}" for name, ms in self.as_dict().items())
+
+    def as_dict(self):
+        """Span durations in ms (summed per stage name) for structured logs."""
+        result = {}
+        for name, seconds in self.spans:
+            result[name] = round(result.get(name, 0.0) + seconds * 1000, 3)
+        return result
+
+
+def start_request_timing() -> RequestTiming:
+    timing = RequestTiming()
+    _current.set(timing)
+    return timing
+
+
+def current_timing():
+    return _current.get()
+
+
+def record_stage(name: str, seconds: float):
+    """Add a span to the current request's timing, if there is one."""
+    timing = _current.get()
+    if timing is not None:
+        timing.add(name, seconds)
+
+
+@contextmanager
+def stage(name: str):
+    """Time a block as a stage of the current request (no-op outside one)."""
+    timing = _current.get()
+    if timing is None:
+        yield
+        return
+    with timing.stage(name):
+        yield
+
+
+# Shallow copies of served vectorizers (same fitted vocabulary/idf) used by
+# staged_predict: (precleaned, cached) per vectorizer, built on first use
+_vectorizer_variants = weakref.WeakKeyDictionary()
+
+
+def _keep_text(text):
+    return text
+
+
+def _cached_analyzer(vectorizer):
+    """
+    Raw text -> features through the shared text cache: tokens come from
+    tokenize() (memoized per raw text, shared with every version and the
+    compiled scorer), then the vectorizer's stop words and n-grams.
+    """
+    token_re = re.compile(vectorizer.token_pattern)
+    stop_words = vectorizer.get_stop_words()
+    stop_words = frozenset(stop_words) if stop_words is not None else None
+    ngram_range = tuple(vectorizer.ngram_range)
+    return lambda text: word_ngrams(tokenize(text, token_re), stop_words, ngram_range)
+
+
+def _variants(vectorizer):
+    """
+    (precleaned, cached) copies of `vectorizer`: `precleaned` has
+    preprocessor=_keep_text, so transform() of cleaned text does not run
+    clean_text a second time; `cached` analyzes raw text with
+    _cached_analyzer (None unless it is a plain "word" analyzer).
+    """
+    variants = _vectorizer_variants.get(vectorizer)
+    if variants is None:
+        precleaned = copy.copy(vectorizer)
+        precleaned.preprocessor = _keep_text
+
+        cached = None
+        if vectorizer.analyzer == "word" and vectorizer.tokenizer is None:
+            cached = copy.copy(vectorizer)
+            cached.analyzer = _cached_analyzer(vectorizer)
+
+        variants = _vectorizer_variants[vectorizer] = (precleaned, cached)
+    return variants
+
+
+def staged_predict(model, texts, cleaned=None):
+    """
+    model.predict(texts), timed as separate clean / transform / score
+    stages for the clean_text + vectorizer + classifier models this API
+    serves; other models are timed as a single "score" stage.
+
+    `cleaned` may pass in clean_text(texts) when the caller already has it.
+    Text is cleaned once (through the shared text cache, keyed by the raw
+    text, when enabled): the transform stage skips the model's clean_text.
+    With the text cache, both model kinds also reuse its token lists.
+    """
+    steps = getattr(model, "steps", None)
+    staged = isinstance(model, CompiledLinearModel) or (
+        steps is not None and len(steps) == 2
+        and getattr(steps[0][1], "preprocessor", None) is clean_text
+    )
+    if not staged:
+        with stage("score"):
+            return model.predict(texts)
+
+    if cleaned is None:
+        with stage("clean"):
+            cleaned = clean_texts(texts)
+
+    if isinstance(model, CompiledLinearModel):
+        with stage("transform"):
+            rows = model.transform(texts, cleaned)
+        with stage("score"):
+            return model.predict_rows(rows)
+
+    precleaned, cached = _variants(steps[0][1])
+    with stage("transform"):
+        if cached is not None and get_text_cache() is not None:
+            features = cached.transform(texts)
+        else:
+            features = precleaned.transform(cleaned)
+    with stage("score"):
+        return steps[1][1].predict(features)
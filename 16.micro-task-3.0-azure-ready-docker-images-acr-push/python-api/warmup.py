@@ -0,0 +1,117 @@
+# warmup.py - Background model preloading + readiness state
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Synthetic inputs used to exercise clean_text / vectorizer / classifier
+WARMUP_TEXTS = [
+    "this is great",
+    "I really did not like this product, terrible service!",
+    "Absolutely fantastic experience... would buy again 10/10",
+]
+
+
+def warm_model(model, predictions: int = 3):
+    """
+    Run a few synthetic predictions so first real requests do not pay for
+    lazy initialisation (regex compilation, page faults on mmapped arrays...).
+    """
+    for i in range(predictions):
+        model.predict(WARMUP_TEXTS[: i + 1])
+    if hasattr(model, "predict_proba"):
+        model.predict_proba(WARMUP_TEXTS)
+
+
+class ModelWarmup:
+    """
+    Preloads the latest version plus a list of pinned versions in parallel
+    and runs a few synthetic predictions on each, off the request path.
+
+    `ready` becomes True once every model loaded and warmed successfully;
+    `status()` reports per-model load / warm-up times and errors.
+    """
+
+    def __init__(self, registry, pinned_versions=(), predictions: int = 3,
+                 max_workers: int = 4):
+        self.registry = registry
+        self.pinned_versions = [v for v in pinned_versions if v]
+        self.predictions = predictions
+        self.max_workers = max_workers
+
+        self.ready = False
+        self.finished = False
+        self.started_at = None
+        self.duration_ms = None
+        self.models = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+    def start(self):
+        """Run warm-up in a background thread and return immediately."""
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self.run, name="model-warmup", daemon=True)
+        self._thread.start()
+
+    def run(self):
+        start = time.perf_counter()
+        targets = self._targets()
+
+        workers = max(1, min(self.max_workers, len(targets)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="warmup") as pool:
+            results = list(pool.map(self._warm_one, targets))
+
+        with self._lock:
+            self.duration_ms = round((time.perf_counter() - start) * 1000, 2)
+            self.finished = True
+            self.ready = bool(results) and all(results)
+
+    def _targets(self):
+        targets = []
+        if self.registry.list_versions():
+            targets.append(self.registry.get_latest_version())
+        else:
+            targets.append(None)  # registry/latest/ alias only
+
+        for version in self.pinned_versions:
+            if version not in targets:
+                targets.append(version)
+        return targets
+
+    def _warm_one(self, version):
+        name = version or "latest"
+        status = {"loaded": False}
+        with self._lock:
+            self.models[name] = status
+
+        try:
+            t0 = time.perf_counter()
+            if version is None:
+                model, _ = self.registry.get_latest_model()
+            else:
+                model, _ = self.registry.get_model(version)
+            status["load_ms"] = round((time.perf_counter() - t0) * 1000, 2)
+            status["loaded"] = True
+
+            t0 = time.perf_counter()
+            warm_model(model, self.predictions)
+            status["warmup_ms"] = round((time.perf_counter() - t0) * 1000, 2)
+            return True
+        except Exception as ex:
+            status["error"] = str(ex)
+            return False
+
+    # -------------------------------------------------------------------------
+    # Introspection
+    # -------------------------------------------------------------------------
+    def status(self):
+        with self._lock:
+            return {
+                "ready": self.ready,
+                "finished": self.finished,
+                "durationMs": self.duration_ms,
+                "models": {name: dict(s) for name, s in self.models.items()},
+            }